@@ -16,21 +16,40 @@ Usage::
 
 from __future__ import annotations
 
+import sys
+from bisect import bisect_right
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
 
 from .normalize import normalize_hts_code
 
 
 # ── Data classes ──────────────────────────────────────────────────────────────
 
-@dataclass
+class OrderType(IntEnum):
+    AD = 0
+    CVD = 1
+    AD_CVD = 2
+
+    @property
+    def label(self) -> str:
+        """Public spelling used in API output: ``"AD"``, ``"CVD"`` or ``"AD+CVD"``."""
+        return _ORDER_TYPE_LABELS[self]
+
+
+_ORDER_TYPE_LABELS = ("AD", "CVD", "AD+CVD")
+
+
+@dataclass(frozen=True, slots=True)
 class ADCVDOrder:
     case_number: str
-    order_type: str                # "AD", "CVD", or "AD+CVD"
+    order_type: OrderType
     product_description: str
     product_description_zh: str
     country: str                   # ISO-2
-    hts_prefixes: list[str]        # 4-digit HTS prefixes covered
+    hts_prefixes: tuple[str, ...]  # 4-digit HTS prefixes covered
     rate_range_low_pct: float
     rate_range_high_pct: float
     all_others_rate_pct: float
@@ -39,10 +58,20 @@ class ADCVDOrder:
     federal_register_citation: str
     notes: list[str] = field(default_factory=list)
 
-    def as_dict(self) -> dict:
-        return {
+    # Orders are static reference data, so the serialised form is built once
+    # in __post_init__; as_dict() hands out copies so callers cannot alter it.
+    _dict: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Intern the short keys used in index lookups and status filters.
+        for name in ("case_number", "country", "status"):
+            object.__setattr__(self, name, sys.intern(getattr(self, name)))
+        object.__setattr__(
+            self, "hts_prefixes", tuple(sys.intern(p) for p in self.hts_prefixes)
+        )
+        object.__setattr__(self, "_dict", {
             "case_number": self.case_number,
-            "order_type": self.order_type,
+            "order_type": self.order_type.label,
             "product_description": self.product_description,
             "product_description_zh": self.product_description_zh,
             "country": self.country,
@@ -53,23 +82,47 @@ class ADCVDOrder:
             "status": self.status,
             "federal_register_citation": self.federal_register_citation,
             "notes": self.notes,
-        }
+        })
+
+    def as_dict(self) -> dict:
+        return {**self._dict, "notes": list(self.notes)}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ADCVDExposure:
     hts_code: str
     origin: str
-    matching_orders: list[ADCVDOrder]
+    matching_orders: tuple[ADCVDOrder, ...]
     estimated_additional_pct: float
     risk_level: str
+    # Serialised form, built on the first as_dict() call and then reused;
+    # each call returns a copy with its own matching_orders list.
+    _dict: dict | None = field(default=None, init=False, repr=False, compare=False)
 
     def as_dict(self) -> dict:
+        if self._dict is None:
+            object.__setattr__(self, "_dict", self._build_dict())
+        if not self.matching_orders:
+            return {**self._dict, "matching_orders": []}
+        return {**self._dict, "matching_orders": [o.as_dict() for o in self.matching_orders]}
+
+    def _build_dict(self) -> dict:
+        if not self.matching_orders:
+            # No orders means zero rate and no warning; skip round()/f-string.
+            return {
+                "hts_code": self.hts_code,
+                "origin": self.origin,
+                "matching_orders_count": 0,
+                "matching_orders": [],
+                "estimated_additional_pct": 0.0,
+                "risk_level": "none",
+                "warning": None,
+            }
         return {
             "hts_code": self.hts_code,
             "origin": self.origin,
             "matching_orders_count": len(self.matching_orders),
-            "matching_orders": [o.as_dict() for o in self.matching_orders],
+            "matching_orders": None,  # fresh copies filled in by as_dict()
             "estimated_additional_pct": round(self.estimated_additional_pct, 2),
             "risk_level": self.risk_level,
             "warning": (
@@ -77,7 +130,7 @@ class ADCVDExposure:
                 f"on top of all other duties. This is the 'all others' rate — "
                 f"your actual rate depends on Commerce Dept. administrative review. "
                 f"Consult a trade attorney or customs broker."
-            ) if self.matching_orders else None,
+            ),
         }
 
 
@@ -85,15 +138,15 @@ class ADCVDExposure:
 
 _CHINA = "CN"
 
-_ADCVD_ORDERS: list[ADCVDOrder] = [
+_ADCVD_ORDERS: tuple[ADCVDOrder, ...] = (
     # ── Aluminum ──────────────────────────────────────────────────────────────
     ADCVDOrder(
         case_number="A-570-967 / C-570-968",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Aluminum Extrusions",
         product_description_zh="铝型材",
         country=_CHINA,
-        hts_prefixes=["7604", "7608", "7610", "7615", "7616"],
+        hts_prefixes=("7604", "7608", "7610", "7615", "7616"),
         rate_range_low_pct=32.79,
         rate_range_high_pct=374.15,
         all_others_rate_pct=32.79,
@@ -107,11 +160,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-053",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Common Alloy Aluminum Sheet",
         product_description_zh="普通合金铝板",
         country=_CHINA,
-        hts_prefixes=["7606"],
+        hts_prefixes=("7606",),
         rate_range_low_pct=49.43,
         rate_range_high_pct=176.2,
         all_others_rate_pct=59.31,
@@ -121,11 +174,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-116 / C-570-117",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Aluminum Foil",
         product_description_zh="铝箔",
         country=_CHINA,
-        hts_prefixes=["7607"],
+        hts_prefixes=("7607",),
         rate_range_low_pct=19.34,
         rate_range_high_pct=106.09,
         all_others_rate_pct=48.64,
@@ -135,11 +188,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-075 / C-570-076",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Aluminum Wire and Cable",
         product_description_zh="铝线缆",
         country=_CHINA,
-        hts_prefixes=["7605", "7614", "8544"],
+        hts_prefixes=("7605", "7614", "8544"),
         rate_range_low_pct=58.51,
         rate_range_high_pct=188.56,
         all_others_rate_pct=58.51,
@@ -151,11 +204,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     # ── Steel ─────────────────────────────────────────────────────────────────
     ADCVDOrder(
         case_number="A-570-504",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Steel Wire Rope",
         product_description_zh="钢丝绳",
         country=_CHINA,
-        hts_prefixes=["7312"],
+        hts_prefixes=("7312",),
         rate_range_low_pct=12.56,
         rate_range_high_pct=44.99,
         all_others_rate_pct=44.99,
@@ -165,11 +218,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-900 / C-570-901",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Steel Nails",
         product_description_zh="钢钉",
         country=_CHINA,
-        hts_prefixes=["7317"],
+        hts_prefixes=("7317",),
         rate_range_low_pct=21.24,
         rate_range_high_pct=118.04,
         all_others_rate_pct=118.04,
@@ -179,11 +232,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-894 / C-570-895",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Circular Welded Steel Pipe",
         product_description_zh="焊接圆钢管",
         country=_CHINA,
-        hts_prefixes=["7306"],
+        hts_prefixes=("7306",),
         rate_range_low_pct=29.57,
         rate_range_high_pct=85.55,
         all_others_rate_pct=85.55,
@@ -195,11 +248,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     # ── Kitchen / Hardware ────────────────────────────────────────────────────
     ADCVDOrder(
         case_number="A-570-998 / C-570-999",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Steel Racks / Kitchen Shelving",
         product_description_zh="钢制货架/厨房置物架",
         country=_CHINA,
-        hts_prefixes=["7321", "7323", "7326"],
+        hts_prefixes=("7321", "7323", "7326"),
         rate_range_low_pct=50.09,
         rate_range_high_pct=119.63,
         all_others_rate_pct=119.63,
@@ -210,11 +263,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-890",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Steel Wire Garment Hangers",
         product_description_zh="钢丝衣架",
         country=_CHINA,
-        hts_prefixes=["7326"],
+        hts_prefixes=("7326",),
         rate_range_low_pct=15.39,
         rate_range_high_pct=187.25,
         all_others_rate_pct=187.25,
@@ -226,11 +279,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     # ── Other ─────────────────────────────────────────────────────────────────
     ADCVDOrder(
         case_number="A-570-979 / C-570-980",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Crystalline Silicon Photovoltaic Cells",
         product_description_zh="晶硅光伏电池",
         country=_CHINA,
-        hts_prefixes=["8541"],
+        hts_prefixes=("8541",),
         rate_range_low_pct=15.97,
         rate_range_high_pct=238.95,
         all_others_rate_pct=238.95,
@@ -240,11 +293,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-601",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Tapered Roller Bearings",
         product_description_zh="圆锥滚子轴承",
         country=_CHINA,
-        hts_prefixes=["8482"],
+        hts_prefixes=("8482",),
         rate_range_low_pct=2.71,
         rate_range_high_pct=66.00,
         all_others_rate_pct=66.00,
@@ -254,11 +307,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-847",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Wooden Bedroom Furniture",
         product_description_zh="木质卧室家具",
         country=_CHINA,
-        hts_prefixes=["9403"],
+        hts_prefixes=("9403",),
         rate_range_low_pct=0.0,
         rate_range_high_pct=198.08,
         all_others_rate_pct=198.08,
@@ -268,11 +321,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-082 / C-570-083",
-        order_type="AD+CVD",
+        order_type=OrderType.AD_CVD,
         product_description="Quartz Surface Products",
         product_description_zh="石英石面板",
         country=_CHINA,
-        hts_prefixes=["6810"],
+        hts_prefixes=("6810",),
         rate_range_low_pct=45.32,
         rate_range_high_pct=294.57,
         all_others_rate_pct=294.57,
@@ -282,11 +335,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-831",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Honey",
         product_description_zh="蜂蜜",
         country=_CHINA,
-        hts_prefixes=["0409"],
+        hts_prefixes=("0409",),
         rate_range_low_pct=25.88,
         rate_range_high_pct=183.80,
         all_others_rate_pct=183.80,
@@ -296,11 +349,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-909",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Laminated Woven Sacks",
         product_description_zh="复合编织袋",
         country=_CHINA,
-        hts_prefixes=["6305"],
+        hts_prefixes=("6305",),
         rate_range_low_pct=64.28,
         rate_range_high_pct=91.73,
         all_others_rate_pct=91.73,
@@ -310,11 +363,11 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
     ),
     ADCVDOrder(
         case_number="A-570-075",
-        order_type="AD",
+        order_type=OrderType.AD,
         product_description="Polyester Textured Yarn",
         product_description_zh="涤纶变形纱",
         country=_CHINA,
-        hts_prefixes=["5402"],
+        hts_prefixes=("5402",),
         rate_range_low_pct=32.85,
         rate_range_high_pct=56.11,
         all_others_rate_pct=56.11,
@@ -322,69 +375,165 @@ _ADCVD_ORDERS: list[ADCVDOrder] = [
         status="active",
         federal_register_citation="85 FR 15769",
     ),
-]
+)
 
 # ── China alias keys (reuse from tariff_overlay) ─────────────────────────────
 
-_CHINA_KEYS = {"CN", "CHN", "CHINA", "中国", "PRC"}
+_CHINA_KEYS = frozenset({"CN", "CHN", "CHINA", "中国", "PRC"})
+
+
+def _origin_key(origin: str) -> str:
+    # Nearly every caller passes the literal default; skip strip/upper for it.
+    if origin == "CN":
+        return "CN"
+    return origin.strip().upper()
+
+
+# ── Status index ──────────────────────────────────────────────────────────────
+
+def _build_status_index(orders: tuple[ADCVDOrder, ...]) -> dict[str, tuple[ADCVDOrder, ...]]:
+    index: dict[str, list[ADCVDOrder]] = {}
+    for order in orders:
+        index.setdefault(order.status, []).append(order)
+    return {status: tuple(bucket) for status, bucket in index.items()}
+
+
+# status → orders, so get_all_orders never rescans the table.
+_STATUS_INDEX: dict[str, tuple[ADCVDOrder, ...]] = _build_status_index(_ADCVD_ORDERS)
+
+_ACTIVE_ORDERS: tuple[ADCVDOrder, ...] = _STATUS_INDEX.get("active", ())
+
+
+# ── Prefix index ──────────────────────────────────────────────────────────────
+# Orders are keyed by their exact HTS prefixes.  A lookup probes the code's
+# leading digits once per distinct prefix length (today only 4-digit headings)
+# instead of running startswith() over every order.  Results keep the
+# declaration order of _ADCVD_ORDERS.
+
+_ORDER_POS: dict[int, int] = {id(o): i for i, o in enumerate(_ACTIVE_ORDERS)}
+
+
+def _build_prefix_index(orders: tuple[ADCVDOrder, ...]) -> dict[str, tuple[ADCVDOrder, ...]]:
+    index: dict[str, list[ADCVDOrder]] = {}
+    for order in orders:
+        for prefix in order.hts_prefixes:
+            bucket = index.setdefault(prefix, [])
+            if order not in bucket:
+                bucket.append(order)
+    return {prefix: tuple(bucket) for prefix, bucket in index.items()}
+
+
+_PREFIX_INDEX: dict[str, tuple[ADCVDOrder, ...]] = _build_prefix_index(_ACTIVE_ORDERS)
+
+_PREFIX_LENGTHS: tuple[int, ...] = tuple(sorted({len(p) for p in _PREFIX_INDEX}))
+
+
+_MIN_PREFIX_LEN = _PREFIX_LENGTHS[0]
+
+
+def _match_prefixes(norm: str) -> tuple[ADCVDOrder, ...]:
+    if len(norm) < _MIN_PREFIX_LEN:
+        # Too short to carry any order prefix (includes unparseable input).
+        return ()
+    if len(_PREFIX_LENGTHS) == 1:
+        return _PREFIX_INDEX.get(norm[:_PREFIX_LENGTHS[0]], ())
+    hits: dict[int, ADCVDOrder] = {}
+    for n in _PREFIX_LENGTHS:
+        if n > len(norm):
+            break
+        for order in _PREFIX_INDEX.get(norm[:n], ()):
+            hits[id(order)] = order
+    return tuple(hits[k] for k in sorted(hits, key=_ORDER_POS.__getitem__))
+
+
+def _build_chapter_index(orders: tuple[ADCVDOrder, ...]) -> dict[str, tuple[ADCVDOrder, ...]]:
+    index: dict[str, list[ADCVDOrder]] = {}
+    for order in orders:
+        for chapter in dict.fromkeys(p[:2] for p in order.hts_prefixes):
+            index.setdefault(chapter, []).append(order)
+    return {chapter: tuple(bucket) for chapter, bucket in index.items()}
+
+
+# 2-digit HTS chapter → active orders with at least one prefix in that chapter.
+_CHAPTER_INDEX: dict[str, tuple[ADCVDOrder, ...]] = _build_chapter_index(_ACTIVE_ORDERS)
 
 
 # ── Lookup functions ──────────────────────────────────────────────────────────
 
+# Upper bounds (exclusive) for each non-zero risk band.
+_RISK_THRESHOLDS = (20, 50, 150)
+_RISK_LABELS = ("low", "moderate", "high", "extreme")
+
+
 def _risk_level(pct: float) -> str:
     if pct == 0:
         return "none"
-    if pct < 20:
-        return "low"
-    if pct < 50:
-        return "moderate"
-    if pct < 150:
-        return "high"
-    return "extreme"
+    return _RISK_LABELS[bisect_right(_RISK_THRESHOLDS, pct)]
+
+
+@lru_cache(maxsize=4096)
+def _lookup_adcvd_cached(
+    norm: str, origin_key: str,
+) -> tuple[tuple[ADCVDOrder, ...], float, str]:
+    matches: tuple[ADCVDOrder, ...] = ()
+    if origin_key in _CHINA_KEYS:
+        matches = _match_prefixes(norm)
+    best_rate = max((o.all_others_rate_pct for o in matches), default=0.0)
+    return matches, best_rate, _risk_level(best_rate)
 
 
 def lookup_adcvd(hts_code: str, origin: str = "CN") -> ADCVDExposure:
     """Check if an HTS code falls under any active AD/CVD orders."""
-    origin_key = origin.strip().upper()
     norm = normalize_hts_code(hts_code) or ""
-
-    matches: list[ADCVDOrder] = []
-
-    if origin_key in _CHINA_KEYS:
-        for order in _ADCVD_ORDERS:
-            if order.status != "active":
-                continue
-            for prefix in order.hts_prefixes:
-                if norm.startswith(prefix):
-                    matches.append(order)
-                    break
-
-    best_rate = max((o.all_others_rate_pct for o in matches), default=0.0)
+    matches, best_rate, risk = _lookup_adcvd_cached(norm, _origin_key(origin))
 
     return ADCVDExposure(
         hts_code=hts_code,
         origin=origin,
         matching_orders=matches,
         estimated_additional_pct=best_rate,
-        risk_level=_risk_level(best_rate),
+        risk_level=risk,
     )
 
 
+def lookup_adcvd_batch(hts_codes: Iterable[str], origin: str = "CN") -> list[ADCVDExposure]:
+    """Run :func:`lookup_adcvd` over many codes sharing one origin.
+
+    Intended for invoice-sized lists: the origin is resolved once and
+    repeated codes hit the match cache.  Results are in input order.
+    """
+    origin_key = _origin_key(origin)
+    exposures: list[ADCVDExposure] = []
+    for hts_code in hts_codes:
+        matches, best_rate, risk = _lookup_adcvd_cached(
+            normalize_hts_code(hts_code) or "", origin_key,
+        )
+        exposures.append(ADCVDExposure(
+            hts_code=hts_code,
+            origin=origin,
+            matching_orders=matches,
+            estimated_additional_pct=best_rate,
+            risk_level=risk,
+        ))
+    return exposures
+
+
 def get_all_orders(origin: str = "CN", status: str = "active") -> list[ADCVDOrder]:
     """Return all AD/CVD orders for a given country."""
-    origin_key = origin.strip().upper()
+    origin_key = _origin_key(origin)
     if origin_key not in _CHINA_KEYS:
         return []
-    return [o for o in _ADCVD_ORDERS if o.status == status]
+    return list(_STATUS_INDEX.get(status, ()))
 
 
 def get_orders_by_chapter(chapter: str, origin: str = "CN") -> list[ADCVDOrder]:
     """Return AD/CVD orders matching a specific HTS chapter."""
-    origin_key = origin.strip().upper()
+    origin_key = _origin_key(origin)
     if origin_key not in _CHINA_KEYS:
         return []
-    return [
-        o for o in _ADCVD_ORDERS
-        if o.status == "active"
-        and any(p.startswith(chapter) for p in o.hts_prefixes)
-    ]
+    if len(chapter) == 2:
+        return list(_CHAPTER_INDEX.get(chapter, ()))
+    # Longer filters narrow the chapter bucket; shorter ones need a full scan.
+    candidates = _CHAPTER_INDEX.get(chapter[:2], ()) if len(chapter) > 2 else _ACTIVE_ORDERS
+    n = len(chapter)
+    return [o for o in candidates if any(p[:n] == chapter for p in o.hts_prefixes)]
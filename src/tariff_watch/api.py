@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import date, timedelta
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from .db import (
     apply_schema,
@@ -20,8 +26,9 @@ from .db import (
 )
 from .antidumping import get_all_orders, get_orders_by_chapter, lookup_adcvd
 from .normalize import normalize_hts_code, parse_rate
-from .sources_usitc import fetch_live_rates
-from .tariff_overlay import compute_overlay
+from .http import close_session
+from .sources_usitc import fetch_live_rates, get_base_rate, warm_live_cache
+from .tariff_overlay import TariffOverlay, compute_overlay
 from .sources_fx import calculate_fx_impact, get_all_fx_rates, get_fx_history, get_fx_rate
 from .sources_shipping import (
     calculate_shipping_cost,
@@ -33,31 +40,10 @@ from .trade_compliance import get_compliance_report, get_entry_requirements
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Tariff Watch API",
-    description=(
-        "Query current US HTS tariff rates, AD/CVD duties, trade compliance, "
-        "exchange rates, shipping costs, and Federal Register tariff notices. "
-        "Supports global traders from any origin country."
-    ),
-    version="3.2.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=os.environ.get("CORS_ORIGINS", "*").split(","),
-    allow_methods=["GET"],
-    allow_headers=["*"],
-)
-
-
 _scheduler = None  # background data scheduler
 
 
-@app.on_event("startup")
-def startup() -> None:
+def _startup() -> None:
     global _scheduler
     try:
         init_pool()
@@ -66,6 +52,11 @@ def startup() -> None:
     except Exception as e:
         logger.warning("PostgreSQL not available, running in live-only mode: %s", e)
 
+    # Effective-rate and profit endpoints need the live USITC table; fetch it
+    # now rather than on the first request.
+    if os.environ.get("TARIFF_WATCH_WARM_LIVE_CACHE", "1") != "0":
+        warm_live_cache()
+
     # Start background data scheduler (SQLite-based, no PG needed)
     try:
         from .scheduler import start_scheduler
@@ -75,17 +66,81 @@ def startup() -> None:
         logger.warning("Scheduler failed to start: %s", e)
 
 
-@app.on_event("shutdown")
-def shutdown() -> None:
+def _shutdown() -> None:
     global _scheduler
     if _scheduler:
         from .scheduler import stop_scheduler
         stop_scheduler(_scheduler)
         _scheduler = None
+    close_session()
     from .db import close_pool
     close_pool()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    _startup()
+    try:
+        yield
+    finally:
+        _shutdown()
+
+
+app = FastAPI(
+    title="Tariff Watch API",
+    description=(
+        "Query current US HTS tariff rates, AD/CVD duties, trade compliance, "
+        "exchange rates, shipping costs, and Federal Register tariff notices. "
+        "Supports global traders from any origin country."
+    ),
+    version="3.2.0",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=os.environ.get("CORS_ORIGINS", "*").split(","),
+    allow_methods=["GET"],
+    allow_headers=["*"],
+)
+# Multi-KB JSON lists (tariff prefixes, notices, trending) compress 5-10x;
+# level 1 keeps the CPU cost negligible.  Empty 304 bodies are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
+
+# ── HTTP caching ──────────────────────────────────────────────────────────────
+# Tariff, history, notice and category data change at most weekly, so those
+# endpoints send an ETag and let clients/CDNs revalidate cheaply.  The tag is
+# weak: it is computed over the JSON before GZipMiddleware, so the gzip and
+# identity encodings share it, which a strong validator must not do.
+
+_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §8.8.3.2): the ``W/`` prefix is ignored on both sides."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _cached_json(request: Request, payload: Any) -> Response:
+    """Serialise *payload* once and answer ``If-None-Match`` with 304 on a match."""
+    body = orjson.dumps(jsonable_encoder(payload), option=orjson.OPT_NON_STR_KEYS)
+    etag = f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ── Health ───────────────────────────────────────────────────────────────────
 
 @app.get("/health", tags=["meta"])
@@ -125,8 +180,8 @@ def tariff_news(
     return get_tariff_news(limit=limit)
 
 
-@app.get("/tariff/{hts_code}", tags=["tariff"])
-def get_tariff(hts_code: str) -> list[dict[str, Any]]:
+@app.get("/tariff/{hts_code}", tags=["tariff"], response_model=list[dict[str, Any]])
+def get_tariff(hts_code: str, request: Request) -> Response:
     """
     Return current tariff rates for an HTS code or prefix.
 
@@ -146,13 +201,13 @@ def get_tariff(hts_code: str) -> list[dict[str, Any]]:
     except Exception:
         rows = []
     if rows:
-        return rows
+        return _cached_json(request, rows)
 
     # DB is empty (scheduler has not run yet) — fall back to live USITC query.
     logger.info("DB has no data for prefix %s — trying live USITC lookup.", prefix)
     live_rows = fetch_live_rates(prefix)
     if live_rows:
-        return live_rows
+        return _cached_json(request, live_rows)
 
     raise HTTPException(
         status_code=404,
@@ -166,8 +221,8 @@ def get_tariff(hts_code: str) -> list[dict[str, Any]]:
 
 # ── Live tariff lookup (always fresh from USITC) ──────────────────────────────
 
-@app.get("/live/tariff/{hts_code}", tags=["tariff"])
-def get_tariff_live(hts_code: str) -> list[dict[str, Any]]:
+@app.get("/live/tariff/{hts_code}", tags=["tariff"], response_model=list[dict[str, Any]])
+def get_tariff_live(hts_code: str) -> Response:
     """
     Return **live** tariff rates fetched directly from USITC (no database needed).
 
@@ -193,7 +248,9 @@ def get_tariff_live(hts_code: str) -> list[dict[str, Any]]:
                 "table. Check that the HTS code prefix is valid."
             ),
         )
-    return rows
+    # Live rows are plain str/float/None, so hand them straight to orjson and
+    # skip response-model validation of every row.
+    return Response(content=orjson.dumps(rows), media_type="application/json")
 
 
 # ── Effective tariff (MFN + all overlays by origin) ───────────────────────────
@@ -204,27 +261,21 @@ def _lookup_base_rate(hts: str) -> tuple[float, str]:
     Walks from the full code toward a 5-digit prefix until a rate is found
     in the live USITC table.  Returns (0.0, "not_found") if nothing matches.
     """
-    import re as _re
     try:
-        rows = fetch_live_rates(hts[:4])
-        rate_map: dict[str, str] = {}
-        for r in rows:
-            raw_code = normalize_hts_code(str(r.get("hts_code") or ""))
-            raw = str(r.get("rate_general_raw") or "").strip()
-            if raw_code and raw and raw.lower() not in ("none", ""):
-                rate_map[raw_code] = raw
-        for length in range(len(hts), 4, -1):
-            candidate = hts[:length]
-            if candidate in rate_map:
-                raw = rate_map[candidate]
-                if raw.strip().lower() == "free":
-                    return 0.0, "usitc_live"
-                m = _re.search(r"(\d+\.?\d*)%", raw)
-                if m:
-                    return float(m.group(1)), "usitc_live"
+        return get_base_rate(hts)
     except Exception:
-        pass
-    return 0.0, "not_found"
+        return 0.0, "not_found"
+
+
+def _effective_overlay(code: str, origin: str) -> tuple[TariffOverlay, str]:
+    """Return ``(overlay, base_rate_source)`` for an already-normalized code.
+
+    Callers normalize once; nothing here re-normalizes.  ``compute_overlay``
+    memoises on the base rate it is given, so a USITC refresh that changes
+    the rate is still picked up.
+    """
+    base_pct, source = _lookup_base_rate(code) if code else (0.0, "no_hts")
+    return compute_overlay(hts_code=code, origin=origin, base_rate_pct=base_pct), source
 
 
 @app.get("/tariff/{hts_code}/effective", tags=["tariff"])
@@ -253,18 +304,18 @@ def get_tariff_effective(
     if not code:
         raise HTTPException(status_code=422, detail=f"Invalid HTS code: {hts_code!r}")
 
-    base_pct, source = _lookup_base_rate(code)
-    overlay = compute_overlay(hts_code=code, origin=origin, base_rate_pct=base_pct)
+    overlay, source = _effective_overlay(code, origin)
     result = overlay.as_dict()
     result["base_rate_source"] = source
     return result
 
 
-@app.get("/tariff/{hts_code}/history", tags=["tariff"])
+@app.get("/tariff/{hts_code}/history", tags=["tariff"], response_model=list[dict[str, Any]])
 def get_tariff_history(
     hts_code: str,
+    request: Request,
     limit: int = Query(default=52, ge=1, le=200, description="Max snapshots to return"),
-) -> list[dict[str, Any]]:
+) -> Response:
     """
     Return weekly rate history for an exact 10-digit HTS code.
 
@@ -284,7 +335,7 @@ def get_tariff_history(
             status_code=404,
             detail=f"No history found for HTS code '{code}'.",
         )
-    return rows
+    return _cached_json(request, rows)
 
 
 # ── Changes ───────────────────────────────────────────────────────────────────
@@ -305,27 +356,30 @@ def get_changes(
     """
     prefix = normalize_hts_code(hts) if hts else None
     try:
-        return query_recent_changes(since.isoformat(), hts_prefix=prefix, limit=limit)
+        return query_recent_changes(since, hts_prefix=prefix, limit=limit)
     except Exception:
         return []
 
 
 # ── Federal Register ──────────────────────────────────────────────────────────
 
-@app.get("/notices", tags=["notices"])
+@app.get("/notices", tags=["notices"], response_model=list[dict[str, Any]])
 def get_notices(
+    request: Request,
     limit: int = Query(default=20, ge=1, le=100),
     agency: str | None = Query(default=None, description="Filter by agency name (partial match)"),
-) -> list[dict[str, Any]]:
+) -> Response:
     """
     Return recent Federal Register tariff-related notices.
 
     **Example:** `/notices?limit=10&agency=USTR`
     """
     try:
-        return query_recent_notices(limit=limit, agency=agency)
+        notices = query_recent_notices(limit=limit, agency=agency)
     except Exception:
-        return []
+        # Not cached: the next request should retry the database.
+        return Response(content=b"[]", media_type="application/json")
+    return _cached_json(request, notices)
 
 
 # ── AD/CVD (Anti-Dumping / Countervailing Duties) ────────────────────────────
@@ -539,8 +593,7 @@ def landed_cost(
         raise HTTPException(status_code=422, detail=f"Invalid HTS code: {hts_code!r}")
 
     # 1. Tariff
-    base_pct, source = _lookup_base_rate(code)
-    overlay = compute_overlay(hts_code=code, origin=origin, base_rate_pct=base_pct)
+    overlay, _ = _effective_overlay(code, origin)
 
     # 2. FX
     fx = calculate_fx_impact(origin=origin, cog_local=cog_local, units=units)
@@ -641,9 +694,7 @@ def amazon_profit(
     if not p:
         raise HTTPException(status_code=404, detail=f"ASIN '{asin}' not found.")
 
-    hts: str | None = normalize_hts_code(p["hts_code"])
-    base_pct, source = _lookup_base_rate(hts) if hts else (0.0, "no_hts")
-    overlay = compute_overlay(hts_code=hts or "", origin=origin, base_rate_pct=base_pct)
+    overlay, source = _effective_overlay(normalize_hts_code(p["hts_code"]) or "", origin)
 
     effective_pct = overlay.effective_total_pct
     if include_adcvd:
@@ -678,10 +729,25 @@ def amazon_trending(
     return get_trending_products(category=category if category != "All" else None, limit=limit)
 
 
-@app.get("/amazon/categories", tags=["amazon"])
-def amazon_categories() -> list[dict[str, Any]]:
+@app.get("/amazon/categories", tags=["amazon"], response_model=list[dict[str, Any]])
+def amazon_categories(request: Request) -> Response:
     """Return category-level market stats: avg price, margin, competition, opportunity score."""
-    return get_category_stats()
-
-
-
+    return _cached_json(request, get_category_stats())
+
+
+if __name__ == "__main__":
+    # ``python -m tariff_watch.api``.  "auto" picks uvloop/httptools, which
+    # uvicorn[standard] installs everywhere except Windows.  Each worker keeps
+    # its own USITC cache and DB pool, so size TARIFF_WATCH_POOL_SIZE to match.
+    import uvicorn
+
+    uvicorn.run(
+        "tariff_watch.api:app",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        loop="auto",
+        http="auto",
+        backlog=2048,
+        limit_concurrency=1024,
+        workers=int(os.environ.get("TARIFF_WATCH_WORKERS", "1")),
+    )
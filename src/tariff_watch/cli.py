@@ -6,6 +6,7 @@ import argparse
 import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -73,6 +74,17 @@ def _load_hts_file(path: str) -> list[str]:
 # Sub-command implementations
 # ---------------------------------------------------------------------------
 
+def _load_previous(prev_path: Path | None) -> pd.DataFrame:
+    """Load and normalise the previous snapshot, or an empty frame if none."""
+    import pandas as pd
+    from .normalize import normalize_dataframe
+    from .snapshot import load_snapshot
+
+    if prev_path is None:
+        return pd.DataFrame()
+    return normalize_dataframe(load_snapshot(prev_path))
+
+
 def _cmd_run(args: argparse.Namespace) -> None:
     """Execute the full fetch → diff → report pipeline."""
     try:
@@ -94,7 +106,7 @@ def _cmd_run(args: argparse.Namespace) -> None:
     from .config import ConfigError
     from .http import NetworkError, ParseError
     from .normalize import normalize_dataframe
-    from .snapshot import save_snapshot, find_previous_snapshot, load_snapshot, apply_retention
+    from .snapshot import save_snapshot, find_previous_snapshot, apply_retention
     from .diff import compute_diff
     from .report import write_reports
     from .email_notify import send_report_email
@@ -120,8 +132,17 @@ def _cmd_run(args: argparse.Namespace) -> None:
         prev_df = normalize_dataframe(pd.read_csv(prev_csv, dtype=str)) if prev_csv.exists() else pd.DataFrame()
         source_url = cfg.sources.usitc_hts_export_url or "dry-run (sample data)"
     else:
+        from .sources_fedregister import fetch_notices
+        from .sources_usitc import fetch_hts_dataframe
+
+        # The previous snapshot doesn't depend on today's USITC download, so
+        # load it alongside.  The Federal Register fetch is only started once
+        # every step that can abort the run has passed: pool threads are joined
+        # at interpreter exit, so a fetch in flight would stall a failed run.
+        prev_path = find_previous_snapshot(cfg.storage.snapshots_dir, today)
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tariff-watch")
+        prev_future = pool.submit(_load_previous, prev_path)
         try:
-            from .sources_usitc import fetch_hts_dataframe
             current_df = fetch_hts_dataframe(cfg)
         except ConfigError as exc:
             print(f"[ERROR] {exc}", file=sys.stderr)
@@ -142,10 +163,11 @@ def _cmd_run(args: argparse.Namespace) -> None:
             print(f"[ERROR] Snapshot save failed: {exc}", file=sys.stderr)
             sys.exit(4)
 
-        prev_path = find_previous_snapshot(cfg.storage.snapshots_dir, today)
-        prev_df = load_snapshot(prev_path) if prev_path else pd.DataFrame()
-        if prev_path:
-            prev_df = normalize_dataframe(prev_df)
+        try:
+            prev_df = prev_future.result()
+        except Exception as exc:  # noqa: BLE001
+            print(f"[ERROR] Loading previous snapshot failed: {exc}", file=sys.stderr)
+            sys.exit(4)
 
     try:
         changes = compute_diff(prev_df, current_df) if not prev_df.empty else []
@@ -170,45 +192,35 @@ def _cmd_run(args: argparse.Namespace) -> None:
 
     print(telegram_summary)
 
+    if not args.dry_run:
+        # Overlaps with the DB sync below.
+        notices_future = pool.submit(fetch_notices)
+        pool.shutdown(wait=False)
+
     # ── Persist to PostgreSQL (optional — skips gracefully if DB not available) ──
     if not args.dry_run:
         try:
-            import math as _math
-            from .db import init_pool, apply_schema, upsert_snapshots, insert_changes
+            from .db import (
+                analyze_snapshots, apply_schema, copy_snapshots, init_pool, insert_changes,
+                refresh_current_rates,
+            )
             init_pool()
             apply_schema()
-            # Replace float NaN with None so psycopg2 stores SQL NULL correctly
-            raw_rows = current_df.to_dict(orient="records")
-            rows = [
-                {k: None if (isinstance(v, float) and _math.isnan(v)) else v
-                 for k, v in r.items()}
-                for r in raw_rows
-            ]
-            saved = upsert_snapshots(rows, today.isoformat())
+            saved = copy_snapshots(current_df, today.isoformat())
             logger.info("DB: upserted %d snapshot rows for %s", saved, today)
+            analyze_snapshots()
+            refresh_current_rates()
             if changes:
-                change_rows = [
-                    {
-                        "hts_code": c.get("hts_code", ""),
-                        "description": c.get("description"),
-                        "change_type": c.get("change_type", "rate_changed"),
-                        "field_changed": c.get("field", None),
-                        "old_value": str(c.get("old_value", "")) if c.get("old_value") is not None else None,
-                        "new_value": str(c.get("new_value", "")) if c.get("new_value") is not None else None,
-                    }
-                    for c in changes
-                ]
-                insert_changes(change_rows, today.isoformat())
-                logger.info("DB: inserted %d change records", len(change_rows))
+                inserted = insert_changes(changes, today.isoformat())
+                logger.info("DB: inserted %d change records", inserted)
         except Exception as db_exc:  # noqa: BLE001
             logger.warning("DB sync skipped (PostgreSQL not available): %s", db_exc)
 
     # ── Fetch Federal Register notices (optional) ──────────────────────────────
     if not args.dry_run:
         try:
-            from .sources_fedregister import fetch_notices
             from .db import upsert_notices
-            notices = fetch_notices()
+            notices = notices_future.result()
             if notices:
                 upsert_notices(notices)
                 logger.info("Federal Register: stored %d notice(s)", len(notices))
@@ -269,7 +281,7 @@ def _cmd_lookup(args: argparse.Namespace) -> None:
         sys.exit(4)
 
     # Filter to requested codes using prefix matching
-    results = filter_tracked_hts(df, raw_codes)
+    results = filter_tracked_hts(df, norm_codes)
 
     if results.empty:
         print(f"No HTS rows found matching: {', '.join(raw_codes)}", file=sys.stderr)
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -82,15 +83,26 @@ class AppConfig:
     runtime: RuntimeConfig = field(default_factory=RuntimeConfig)
 
 
-def load_config(path: str | Path) -> AppConfig:
-    path = Path(path)
-    if not path.exists():
-        raise ConfigError(f"Config file not found: {path}")
+# libyaml's C loader when PyYAML was built with it; same safe semantics.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
+
+@lru_cache(maxsize=4)
+def _read_yaml(path: Path, mtime_ns: int) -> dict:
+    # Keyed on mtime so an edited file is re-parsed.  The cached dict is
+    # never mutated: _resolve() builds new containers.
     with path.open("r", encoding="utf-8") as fh:
-        raw: dict = yaml.safe_load(fh) or {}
+        return yaml.load(fh, Loader=_YAML_LOADER) or {}
+
+
+def load_config(path: str | Path) -> AppConfig:
+    path = Path(path)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise ConfigError(f"Config file not found: {path}") from None
 
-    raw = _resolve(raw)
+    raw = _resolve(_read_yaml(path.resolve(), mtime_ns))
 
     cfg = AppConfig()
     cfg.mode = raw.get("mode", "tracked_only")
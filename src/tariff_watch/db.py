@@ -2,19 +2,30 @@
 
 from __future__ import annotations
 
+import io
 import logging
 import os
+import threading
 from contextlib import contextmanager
+from datetime import date
 from pathlib import Path
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, Iterable
 
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
-from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 _pool: ThreadedConnectionPool | None = None
+# One slot per pooled connection: callers beyond maxconn wait for a free
+# connection instead of getting PoolError("connection pool exhausted").
+_pool_slots: threading.BoundedSemaphore | None = None
+_POOL_WAIT_SECONDS = 30.0
 
 # ── Connection pool ──────────────────────────────────────────────────────────
 
@@ -25,40 +36,135 @@ def _dsn() -> str:
         f"port={os.environ.get('PGPORT', '5432')} "
         f"dbname={os.environ.get('PGDATABASE', 'tariff_watch')} "
         f"user={os.environ.get('PGUSER', 'tariff')} "
-        f"password={os.environ.get('PGPASSWORD', 'tariff')}"
+        f"password={os.environ.get('PGPASSWORD', 'tariff')} "
+        # TCP keepalives stop idle pooled connections being reaped by NATs and
+        # proxies, and surface dead ones instead of hanging on them.
+        "keepalives=1 keepalives_idle=30 keepalives_interval=10 keepalives_count=3"
     )
 
 
-def init_pool(minconn: int = 1, maxconn: int = 10) -> None:
-    """Initialise the global connection pool. Call once at application startup."""
-    global _pool
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r; using %d", name, raw, default)
+        return default
+
+
+def _cast_numeric(value: str | None, cur) -> float | None:
+    return None if value is None else float(value)
+
+
+# NUMERIC (OID 1700) -> float.  Rate values are stored from Python floats and
+# serialised as JSON numbers, so building a Decimal per cell only to convert
+# it back in the response encoder is wasted work.
+_NUMERIC_AS_FLOAT = psycopg2.extensions.new_type((1700,), "TW_NUMERIC_FLOAT", _cast_numeric)
+
+
+class _PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which named statements it has PREPAREd.
+
+    Typecasters are registered here, once per physical connection, rather
+    than per cursor or globally.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+        psycopg2.extensions.register_type(_NUMERIC_AS_FLOAT, self)
+
+
+def init_pool(minconn: int | None = None, maxconn: int | None = None) -> None:
+    """Initialise the global connection pool. Call once at application startup.
+
+    The pool is fixed-size by default: ``TARIFF_WATCH_POOL_SIZE`` (8)
+    connections are opened up front and kept until :func:`close_pool`, since
+    psycopg2 closes anything above ``minconn`` as soon as it is returned.
+    ``TARIFF_WATCH_POOL_MIN`` / ``TARIFF_WATCH_POOL_MAX`` override either bound.
+    """
+    global _pool, _pool_slots
     if _pool is not None:
         return
-    _pool = ThreadedConnectionPool(minconn, maxconn, dsn=_dsn())
+    size = _env_int("TARIFF_WATCH_POOL_SIZE", 8)
+    if minconn is None:
+        minconn = _env_int("TARIFF_WATCH_POOL_MIN", size)
+    if maxconn is None:
+        maxconn = _env_int("TARIFF_WATCH_POOL_MAX", size)
+    maxconn = max(maxconn, minconn)
+    _pool = ThreadedConnectionPool(
+        minconn, maxconn, dsn=_dsn(), connection_factory=_PreparingConnection,
+    )
+    _pool_slots = threading.BoundedSemaphore(maxconn)
     logger.info("PostgreSQL pool initialised (min=%d max=%d)", minconn, maxconn)
 
 
 def close_pool() -> None:
-    global _pool
+    global _pool, _pool_slots
     if _pool:
         _pool.closeall()
         _pool = None
+        _pool_slots = None
 
 
 @contextmanager
 def get_conn() -> Generator[psycopg2.extensions.connection, None, None]:
     """Yield a connection from the pool, auto-commit or rollback on exit."""
-    if _pool is None:
+    pool, slots = _pool, _pool_slots
+    if pool is None or slots is None:
         raise RuntimeError("PostgreSQL pool not initialised (DB unavailable)")
-    conn = _pool.getconn()
+    if not slots.acquire(timeout=_POOL_WAIT_SECONDS):
+        raise PoolError(f"no PostgreSQL connection free after {_POOL_WAIT_SECONDS:.0f}s")
     try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
+        conn = pool.getconn()
+        if conn.closed:
+            # Lost since its last use (server restart, keepalive timeout).
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
     finally:
-        _pool.putconn(conn)
+        slots.release()
+
+
+# ── Prepared statements ──────────────────────────────────────────────────────
+# Hot read queries run as server-side prepared statements so repeat calls skip
+# parse/plan.  Transaction-mode PgBouncer hands each transaction a different
+# server connection, so set TARIFF_WATCH_PGBOUNCER_COMPAT=1 behind it.
+
+_PREPARE = os.environ.get("TARIFF_WATCH_PGBOUNCER_COMPAT", "").strip().lower() not in (
+    "1", "true", "yes",
+)
+
+
+def _to_dollar_params(sql: str) -> str:
+    parts = sql.split("%s")
+    out = [parts[0]]
+    for i, part in enumerate(parts[1:], start=1):
+        out.append(f"${i}{part}")
+    return "".join(out)
+
+
+def _execute_prepared(cur, name: str, sql: str, params: tuple) -> None:
+    """Execute *sql* (positional ``%s`` placeholders) as prepared statement *name*."""
+    conn = cur.connection
+    if not _PREPARE or not isinstance(conn, _PreparingConnection):
+        cur.execute(sql, params)
+        return
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {_to_dollar_params(sql)}")
+        conn.prepared.add(name)
+    placeholders = ", ".join(["%s"] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders})", params)
 
 
 # ── Schema bootstrap ─────────────────────────────────────────────────────────
@@ -74,28 +180,74 @@ def apply_schema() -> None:
 
 # ── Write helpers ────────────────────────────────────────────────────────────
 
-def upsert_snapshots(rows: list[dict], snapshot_date: str) -> int:
+# Rows per multi-row INSERT sent by execute_values.
+_PAGE_SIZE = _env_int("TARIFF_WATCH_EXECUTE_VALUES_PAGE_SIZE", 1000)
+
+
+_SNAPSHOT_COLUMNS = (
+    "hts_code", "description",
+    "rate_general_raw", "rate_general_value",
+    "rate_special_raw", "rate_special_value",
+    "rate_column2_raw", "rate_column2_value",
+    "additional_duties_raw",
+)
+
+# COPY text format: backslash, tab and line breaks must be escaped; \N is NULL.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_rows(cur, table: str, columns: tuple[str, ...], rows: Iterable[tuple]) -> None:
+    """Stream *rows* into *table* with ``COPY ... FROM STDIN`` (text format)."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(
+            "\\N" if v is None else str(v).translate(_COPY_ESCAPES) for v in row
+        ))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+
+
+def _merge_snapshots(cur, rows: Iterable[tuple], snapshot_date: str) -> None:
+    """COPY *rows* (ordered as ``_SNAPSHOT_COLUMNS``) into a temporary staging
+    table, then insert them into ``hts_snapshots`` with one statement,
+    upserting instead if the date has already been loaded.
+
+    If a code repeats, the last row wins.
     """
-    Bulk-upsert HTS snapshot rows for *snapshot_date* (YYYY-MM-DD).
-    Returns number of rows inserted/updated.
+    cols = ", ".join(_SNAPSHOT_COLUMNS)
+    cur.execute("""
+        CREATE TEMP TABLE hts_snapshots_stage (
+            seq                  BIGSERIAL,
+            hts_code             TEXT,
+            description          TEXT,
+            rate_general_raw     TEXT,
+            rate_general_value   NUMERIC,
+            rate_special_raw     TEXT,
+            rate_special_value   NUMERIC,
+            rate_column2_raw     TEXT,
+            rate_column2_value   NUMERIC,
+            additional_duties_raw TEXT
+        ) ON COMMIT DROP
+    """)
+    _copy_rows(cur, "hts_snapshots_stage", _SNAPSHOT_COLUMNS, rows)
+    insert = f"""
+        INSERT INTO hts_snapshots (snapshot_date, {cols})
+        SELECT DISTINCT ON (hts_code) %s::date, {cols}
+        FROM hts_snapshots_stage
+        ORDER BY hts_code, seq DESC
     """
-    if not rows:
-        return 0
-
-    sql = """
-        INSERT INTO hts_snapshots (
-            snapshot_date, hts_code, description,
-            rate_general_raw, rate_general_value,
-            rate_special_raw, rate_special_value,
-            rate_column2_raw, rate_column2_value,
-            additional_duties_raw
-        ) VALUES (
-            %(snapshot_date)s, %(hts_code)s, %(description)s,
-            %(rate_general_raw)s, %(rate_general_value)s,
-            %(rate_special_raw)s, %(rate_special_value)s,
-            %(rate_column2_raw)s, %(rate_column2_value)s,
-            %(additional_duties_raw)s
-        )
+    # A new snapshot_date never conflicts, so try the plain INSERT first and
+    # only pay for ON CONFLICT when a date is re-run.
+    cur.execute("SAVEPOINT tw_snapshot_insert")
+    try:
+        cur.execute(insert, (snapshot_date,))
+    except psycopg2.errors.UniqueViolation:
+        cur.execute("ROLLBACK TO SAVEPOINT tw_snapshot_insert")
+    else:
+        cur.execute("RELEASE SAVEPOINT tw_snapshot_insert")
+        return
+    cur.execute(insert + """
         ON CONFLICT (snapshot_date, hts_code) DO UPDATE SET
             description          = EXCLUDED.description,
             rate_general_raw     = EXCLUDED.rate_general_raw,
@@ -105,29 +257,101 @@ def upsert_snapshots(rows: list[dict], snapshot_date: str) -> int:
             rate_column2_raw     = EXCLUDED.rate_column2_raw,
             rate_column2_value   = EXCLUDED.rate_column2_value,
             additional_duties_raw = EXCLUDED.additional_duties_raw
+    """, (snapshot_date,))
+
+
+def upsert_snapshots(rows: list[dict], snapshot_date: str) -> int:
+    """
+    Bulk-upsert HTS snapshot rows for *snapshot_date* (YYYY-MM-DD).
+    Returns number of rows inserted/updated.
     """
-    payload = [{**r, "snapshot_date": snapshot_date} for r in rows]
+    if not rows:
+        return 0
+
+    from pandas import isna
+
+    # NaN/<NA> from DataFrame.to_dict() records is stored as NULL, as in copy_snapshots.
+    values = (
+        tuple(None if isna(v := r.get(c)) else v for c in _SNAPSHOT_COLUMNS) for r in rows
+    )
     with get_conn() as conn:
         with conn.cursor() as cur:
-            psycopg2.extras.execute_batch(cur, sql, payload, page_size=500)
+            _merge_snapshots(cur, values, snapshot_date)
     return len(rows)
 
 
+def copy_snapshots(df: pd.DataFrame, snapshot_date: str) -> int:
+    """
+    Bulk-upsert a normalised HTS DataFrame for *snapshot_date* via COPY.
+
+    Same staging path as :func:`upsert_snapshots`, fed straight from the
+    frame without building a dict per row.  Returns number of rows loaded.
+    """
+    if df.empty:
+        return 0
+
+    frame = df.reindex(columns=list(_SNAPSHOT_COLUMNS)).astype(object)
+    frame = frame.where(frame.notna(), None)
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            _merge_snapshots(cur, frame.itertuples(index=False, name=None), snapshot_date)
+    return len(frame)
+
+
+def _change_row(change: dict, detected_at: str) -> tuple:
+    old, new = change.get("old_value"), change.get("new_value")
+    return (
+        detected_at,
+        change.get("hts_code", ""),
+        change.get("description"),
+        change.get("change_type", "rate_changed"),
+        change.get("field"),
+        None if old is None else str(old),
+        None if new is None else str(new),
+    )
+
+
+def analyze_snapshots() -> None:
+    """``ANALYZE hts_snapshots`` after a bulk load.
+
+    Keeps planner statistics current for the new snapshot; vacuuming is
+    left to autovacuum.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE hts_snapshots")
+
+
+def refresh_current_rates() -> None:
+    """Rebuild the ``current_rates`` view after new snapshots are loaded.
+
+    ``CONCURRENTLY`` keeps the view readable by the API during the refresh.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY current_rates")
+
+
+_CHANGE_COLUMNS = (
+    "detected_at", "hts_code", "description", "change_type",
+    "field_changed", "old_value", "new_value",
+)
+
+
 def insert_changes(changes: list[dict], detected_at: str) -> int:
-    """Persist detected rate changes for *detected_at* (YYYY-MM-DD)."""
+    """Persist detected rate changes for *detected_at* (YYYY-MM-DD).
+
+    *changes* are the dicts returned by :func:`tariff_watch.diff.compute_diff`.
+    ``rate_changes`` is append-only, so rows go straight in with ``COPY``.
+    """
     if not changes:
         return 0
-    sql = """
-        INSERT INTO rate_changes
-            (detected_at, hts_code, description, change_type, field_changed, old_value, new_value)
-        VALUES
-            (%(detected_at)s, %(hts_code)s, %(description)s, %(change_type)s,
-             %(field_changed)s, %(old_value)s, %(new_value)s)
-    """
-    payload = [{**c, "detected_at": detected_at} for c in changes]
     with get_conn() as conn:
         with conn.cursor() as cur:
-            psycopg2.extras.execute_batch(cur, sql, payload, page_size=500)
+            _copy_rows(
+                cur, "rate_changes", _CHANGE_COLUMNS,
+                (_change_row(c, detected_at) for c in changes),
+            )
     return len(changes)
 
 
@@ -138,42 +362,50 @@ def upsert_notices(notices: list[dict]) -> int:
     sql = """
         INSERT INTO federal_register_notices
             (document_number, published_date, title, url, agency, abstract)
-        VALUES
-            (%(document_number)s, %(published_date)s, %(title)s,
-             %(url)s, %(agency)s, %(abstract)s)
+        VALUES %s
         ON CONFLICT (document_number) DO UPDATE SET
             title          = EXCLUDED.title,
             url            = EXCLUDED.url,
             agency         = EXCLUDED.agency,
             abstract       = EXCLUDED.abstract
     """
+    template = """(
+        %(document_number)s, %(published_date)s, %(title)s,
+        %(url)s, %(agency)s, %(abstract)s
+    )"""
+    latest = list({n.get("document_number"): n for n in notices}.values())
     with get_conn() as conn:
         with conn.cursor() as cur:
-            psycopg2.extras.execute_batch(cur, sql, notices, page_size=200)
+            psycopg2.extras.execute_values(cur, sql, latest, template=template, page_size=_PAGE_SIZE)
     return len(notices)
 
 
 # ── Read helpers ─────────────────────────────────────────────────────────────
 
+# RealDictCursor rows are already dicts, so fetchall() is returned as-is
+# rather than copied row by row.
+
 def query_current_rates(hts_prefix: str) -> list[dict]:
     """
     Return the most-recent snapshot row(s) whose hts_code starts with *hts_prefix*.
+
+    Reads the ``current_rates`` view, which holds one row per code.
     """
     sql = """
-        SELECT DISTINCT ON (hts_code)
+        SELECT
             snapshot_date, hts_code, description,
             rate_general_raw, rate_general_value,
             rate_special_raw, rate_special_value,
             rate_column2_raw, rate_column2_value,
             additional_duties_raw
-        FROM hts_snapshots
-        WHERE hts_code LIKE %(prefix)s
-        ORDER BY hts_code, snapshot_date DESC
+        FROM current_rates
+        WHERE hts_code LIKE %s
+        ORDER BY hts_code
     """
     with get_conn() as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(sql, {"prefix": f"{hts_prefix}%"})
-            return [dict(r) for r in cur.fetchall()]
+            _execute_prepared(cur, "tw_current_rates", sql, (f"{hts_prefix}%",))
+            return cur.fetchall()
 
 
 def query_rate_history(hts_code: str, limit: int = 52) -> list[dict]:
@@ -182,53 +414,65 @@ def query_rate_history(hts_code: str, limit: int = 52) -> list[dict]:
         SELECT snapshot_date, rate_general_raw, rate_general_value,
                rate_special_raw, additional_duties_raw
         FROM hts_snapshots
-        WHERE hts_code = %(code)s
+        WHERE hts_code = %s
         ORDER BY snapshot_date DESC
-        LIMIT %(limit)s
+        LIMIT %s
     """
     with get_conn() as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(sql, {"code": hts_code, "limit": limit})
-            return [dict(r) for r in cur.fetchall()]
+            _execute_prepared(cur, "tw_rate_history", sql, (hts_code, limit))
+            return cur.fetchall()
 
 
-def query_recent_changes(since: str, hts_prefix: str | None = None, limit: int = 200) -> list[dict]:
-    """Return rate changes since *since* (YYYY-MM-DD), optionally filtered by prefix."""
-    conditions = ["detected_at >= %(since)s"]
-    params: dict = {"since": since, "limit": limit}
+def query_recent_changes(
+    since: date | str, hts_prefix: str | None = None, limit: int = 200,
+) -> list[dict]:
+    """Return rate changes since *since*, optionally filtered by prefix.
+
+    *since* may be a ``date`` (bound as a typed parameter) or a YYYY-MM-DD string.
+    """
+    # Each filter combination is its own prepared statement.
+    conditions = ["detected_at >= %s"]
+    params: list = [since]
+    name = "tw_recent_changes"
     if hts_prefix:
-        conditions.append("hts_code LIKE %(prefix)s")
-        params["prefix"] = f"{hts_prefix}%"
+        conditions.append("hts_code LIKE %s")
+        params.append(f"{hts_prefix}%")
+        name += "_prefix"
+    params.append(limit)
     where = " AND ".join(conditions)
     sql = f"""
         SELECT detected_at, hts_code, description, change_type, field_changed, old_value, new_value
         FROM rate_changes
         WHERE {where}
         ORDER BY detected_at DESC, hts_code
-        LIMIT %(limit)s
+        LIMIT %s
     """
     with get_conn() as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(sql, params)
-            return [dict(r) for r in cur.fetchall()]
+            _execute_prepared(cur, name, sql, tuple(params))
+            return cur.fetchall()
 
 
 def query_recent_notices(limit: int = 20, agency: str | None = None) -> list[dict]:
     """Return recent Federal Register notices, optionally filtered by agency."""
     conditions = []
-    params: dict = {"limit": limit}
+    params: list = []
+    name = "tw_recent_notices"
     if agency:
-        conditions.append("agency ILIKE %(agency)s")
-        params["agency"] = f"%{agency}%"
+        conditions.append("agency ILIKE %s")
+        params.append(f"%{agency}%")
+        name += "_agency"
+    params.append(limit)
     where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
     sql = f"""
         SELECT document_number, published_date, title, url, agency, abstract
         FROM federal_register_notices
         {where}
         ORDER BY published_date DESC
-        LIMIT %(limit)s
+        LIMIT %s
     """
     with get_conn() as conn:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(sql, params)
-            return [dict(r) for r in cur.fetchall()]
+            _execute_prepared(cur, name, sql, tuple(params))
+            return cur.fetchall()
@@ -6,6 +6,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -17,8 +18,31 @@ def _iso_now() -> str:
     return datetime.now(tz=timezone.utc).isoformat(timespec="seconds")
 
 
-def _get(row: pd.Series, col: str) -> Any:
-    return row[col] if col in row.index else None
+# Columns compute_diff reads; a column absent from a snapshot reads as None.
+_DIFF_COLUMNS = ("description", "rate_general_raw", "rate_general_value")
+
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    # Columns keep their native dtypes (Arrow strings, categoricals); only the
+    # values that end up in a change dict are converted, via _value().
+    cols = ["hts_code", *(c for c in _DIFF_COLUMNS if c in df.columns)]
+    frame = df.loc[df["hts_code"].notna(), cols].drop_duplicates("hts_code", keep="last")
+    for col in _DIFF_COLUMNS:
+        if col not in frame.columns:
+            frame[col] = None
+    return frame
+
+
+def _value(v: Any) -> Any:
+    return None if v is None or v is pd.NA or (isinstance(v, float) and v != v) else v
+
+
+def _stripped(col: pd.Series) -> pd.Series:
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        # Strip each distinct rate string once; code -1 (missing) takes the "".
+        cats = col.cat.categories.astype(str).str.strip().to_numpy(dtype=object)
+        return pd.Series(np.append(cats, "")[col.cat.codes.to_numpy()], index=col.index)
+    return col.astype("string").fillna("").str.strip()
 
 
 def compute_diff(
@@ -31,12 +55,13 @@ def compute_diff(
 
     Returns a list of change dicts with keys:
         hts_code, change_type, old_value, new_value, detected_at, notes
+
+    Missing rates and descriptions compare as empty strings.  If a code
+    repeats within a snapshot, its last row is used.
     """
     if detected_at is None:
         detected_at = _iso_now()
 
-    changes: list[dict[str, Any]] = []
-
         # Guard: allow empty/column-missing inputs (treat as "no diff" baseline)
     if prev is None or prev.empty or "hts_code" not in prev.columns:
         logger.info("Prev snapshot is empty or missing hts_code; returning no changes.")
@@ -45,81 +70,104 @@ def compute_diff(
         logger.info("Current snapshot is empty or missing hts_code; returning no changes.")
         return []
 
-    prev_clean = prev[prev["hts_code"].notna()].copy()
-    curr_clean = current[current["hts_code"].notna()].copy()
-
-    prev_indexed = prev_clean.set_index("hts_code")
-    curr_indexed = curr_clean.set_index("hts_code")
-
-    prev_codes = set(prev_indexed.index)
-    curr_codes = set(curr_indexed.index)
+    # One sorted outer join replaces per-code .loc lookups; only rows that
+    # actually changed are touched in Python below.
+    merged = _prepare(prev).merge(
+        _prepare(current), on="hts_code", how="outer",
+        indicator=True, suffixes=("_old", "_new"), sort=True,
+    )
+    side = merged["_merge"]
 
     # Added
-    for code in sorted(curr_codes - prev_codes):
-        row = curr_indexed.loc[code]
-        changes.append(
-            {
-                "hts_code": code,
-                "change_type": "added",
-                "old_value": None,
-                "new_value": _get(row, "description"),
-                "old_raw": None,
-                "new_raw": _get(row, "rate_general_raw"),
-                "detected_at": detected_at,
-                "notes": "New HTS code detected",
-            }
+    added = merged[side == "right_only"]
+    changes: list[dict[str, Any]] = [
+        {
+            "hts_code": code,
+            "change_type": "added",
+            "old_value": None,
+            "new_value": _value(desc),
+            "old_raw": None,
+            "new_raw": _value(rate),
+            "detected_at": detected_at,
+            "notes": "New HTS code detected",
+        }
+        for code, desc, rate in zip(
+            added["hts_code"], added["description_new"], added["rate_general_raw_new"]
         )
+    ]
 
     # Removed
-    for code in sorted(prev_codes - curr_codes):
-        row = prev_indexed.loc[code]
-        changes.append(
-            {
-                "hts_code": code,
-                "change_type": "removed",
-                "old_value": _get(row, "description"),
-                "new_value": None,
-                "old_raw": _get(row, "rate_general_raw"),
-                "new_raw": None,
-                "detected_at": detected_at,
-                "notes": "HTS code no longer present",
-            }
+    removed = merged[side == "left_only"]
+    changes.extend(
+        {
+            "hts_code": code,
+            "change_type": "removed",
+            "old_value": _value(desc),
+            "new_value": None,
+            "old_raw": _value(rate),
+            "new_raw": None,
+            "detected_at": detected_at,
+            "notes": "HTS code no longer present",
+        }
+        for code, desc, rate in zip(
+            removed["hts_code"], removed["description_old"], removed["rate_general_raw_old"]
         )
+    )
 
     # Changed rows
-    for code in sorted(prev_codes & curr_codes):
-        prev_row = prev_indexed.loc[code]
-        curr_row = curr_indexed.loc[code]
-
+    both = merged[side == "both"]
+    old_desc = _stripped(both["description_old"])
+    new_desc = _stripped(both["description_new"])
+    # Plain arrays from here: selecting the changed rows by position avoids a
+    # label reindex per column and a Series allocation per selection.
+    rate_changed = (
+        _stripped(both["rate_general_raw_old"]) != _stripped(both["rate_general_raw_new"])
+    ).to_numpy(dtype=bool)
+    old_desc = old_desc.to_numpy(dtype=object)
+    new_desc = new_desc.to_numpy(dtype=object)
+    desc_changed = old_desc != new_desc
+    pos = np.flatnonzero(rate_changed | desc_changed)
+
+    def _col(name: str) -> np.ndarray:
+        return both[name].iloc[pos].to_numpy(dtype=object)
+
+    n_rate = n_desc = 0
+    for code, rate_diff, desc_diff, old_rate, new_rate, old_val, new_val, old_d, new_d in zip(
+        _col("hts_code"),
+        rate_changed[pos],
+        desc_changed[pos],
+        _col("rate_general_raw_old"),
+        _col("rate_general_raw_new"),
+        _col("rate_general_value_old"),
+        _col("rate_general_value_new"),
+        old_desc[pos],
+        new_desc[pos],
+    ):
         # Rate change
-        old_rate = _get(prev_row, "rate_general_raw")
-        new_rate = _get(curr_row, "rate_general_raw")
-        if str(old_rate).strip() != str(new_rate).strip():
-            old_val = _get(prev_row, "rate_general_value") if "rate_general_value" in prev_row.index else None
-            new_val = _get(curr_row, "rate_general_value") if "rate_general_value" in curr_row.index else None
+        if rate_diff:
+            n_rate += 1
             changes.append(
                 {
                     "hts_code": code,
                     "change_type": "changed_rate_general",
-                    "old_value": old_val,
-                    "new_value": new_val,
-                    "old_raw": old_rate,
-                    "new_raw": new_rate,
+                    "old_value": _value(old_val),
+                    "new_value": _value(new_val),
+                    "old_raw": _value(old_rate),
+                    "new_raw": _value(new_rate),
                     "detected_at": detected_at,
                     "notes": None,
                 }
             )
 
         # Description change
-        old_desc = str(_get(prev_row, "description") or "").strip()
-        new_desc = str(_get(curr_row, "description") or "").strip()
-        if old_desc != new_desc:
+        if desc_diff:
+            n_desc += 1
             changes.append(
                 {
                     "hts_code": code,
                     "change_type": "changed_description",
-                    "old_value": old_desc or None,
-                    "new_value": new_desc or None,
+                    "old_value": old_d or None,
+                    "new_value": new_d or None,
                     "old_raw": None,
                     "new_raw": None,
                     "detected_at": detected_at,
@@ -129,9 +177,6 @@ def compute_diff(
 
     logger.info(
         "Diff complete: %d added, %d removed, %d rate changes, %d desc changes",
-        sum(1 for c in changes if c["change_type"] == "added"),
-        sum(1 for c in changes if c["change_type"] == "removed"),
-        sum(1 for c in changes if c["change_type"] == "changed_rate_general"),
-        sum(1 for c in changes if c["change_type"] == "changed_description"),
+        len(added), len(removed), n_rate, n_desc,
     )
     return changes
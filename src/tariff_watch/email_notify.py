@@ -12,6 +12,13 @@ from .config import EmailConfig
 
 logger = logging.getLogger(__name__)
 
+# Many relays cap recipients per message (often 50-100); larger lists are
+# sent as several envelopes over the same authenticated session.
+_RCPT_BATCH = 50
+
+# Single-pass HTML escaping for the report body.
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
 
 def _markdown_to_html(markdown_text: str) -> str:
     """
@@ -20,7 +27,7 @@ def _markdown_to_html(markdown_text: str) -> str:
     For richer HTML, integrate a library like 'markdown' (not in dependencies).
     See README for details on improving HTML output.
     """
-    escaped = markdown_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    escaped = markdown_text.translate(_HTML_ESCAPE)
     return (
         "<!DOCTYPE html><html><body>"
         "<p style='font-family:monospace;font-size:13px;'>"
@@ -69,6 +76,10 @@ def send_report_email(
     msg.attach(part_plain)
     msg.attach(part_html)
 
+    # Serialised once and reused for every envelope.
+    raw = msg.as_bytes()
+    recipients = list(cfg.to_emails)
+
     try:
         logger.info("Connecting to SMTP %s:%s (STARTTLS)…", cfg.smtp_host, cfg.smtp_port)
         with smtplib.SMTP(cfg.smtp_host, cfg.smtp_port, timeout=30) as server:  # type: ignore[arg-type]
@@ -76,7 +87,8 @@ def send_report_email(
             server.starttls()
             server.ehlo()
             server.login(cfg.smtp_user, cfg.smtp_password)  # type: ignore[arg-type]
-            server.sendmail(cfg.from_email, cfg.to_emails, msg.as_string())  # type: ignore[arg-type]
+            for i in range(0, len(recipients), _RCPT_BATCH):
+                server.sendmail(cfg.from_email, recipients[i : i + _RCPT_BATCH], raw)  # type: ignore[arg-type]
         logger.info("Email sent to %s", cfg.to_emails)
         return True
     except Exception as exc:  # noqa: BLE001
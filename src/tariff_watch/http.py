@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import logging
-import time
+import threading
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = 10
 DEFAULT_RETRIES = 3
-BACKOFF_BASE = 2.0
+BACKOFF_FACTOR = 1.0
+# Connections kept per host by the shared session; also caps get_many's threads.
+POOL_MAXSIZE = 32
 
 
 class NetworkError(Exception):
@@ -23,8 +29,68 @@ class ParseError(Exception):
     """Raised when response content cannot be parsed."""
 
 
-def _backoff(attempt: int) -> float:
-    return BACKOFF_BASE ** attempt
+# Retries (with exponential backoff, honouring Retry-After) happen inside
+# urllib3 on the pooled connection rather than in a Python sleep loop.
+def _retry(attempts: int) -> Retry:
+    # ``retries`` has always counted total attempts; urllib3 counts retries.
+    return Retry(
+        total=max(0, attempts - 1),
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(429, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _new_session(attempts: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16, pool_maxsize=POOL_MAXSIZE, max_retries=_retry(attempts),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Keep-alive sessions for the whole process, so repeated USITC and Federal
+# Register requests skip the TCP/TLS handshake.  A session's adapter fixes
+# its retry count, so there is one per attempt count in use (normally just
+# DEFAULT_RETRIES).  A session installed with set_session() serves them all.
+_sessions: dict[int, requests.Session] = {}
+_override: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def shared_session(attempts: int = DEFAULT_RETRIES) -> requests.Session:
+    """Return the process-wide session used when ``get`` is not given one."""
+    if _override is not None:
+        return _override
+    session = _sessions.get(attempts)
+    if session is None:
+        with _session_lock:
+            session = _sessions.get(attempts)
+            if session is None:
+                session = _sessions[attempts] = _new_session(attempts)
+    return session
+
+
+def set_session(session: requests.Session | None) -> None:
+    """Replace the shared session (e.g. with a mocked one in tests); None restores it."""
+    global _override
+    with _session_lock:
+        _override = session
+
+
+def close_session() -> None:
+    """Close the shared sessions; a later request opens a fresh one."""
+    global _override
+    with _session_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        if _override is not None:
+            _override.close()
+            _override = None
 
 
 def get(
@@ -36,37 +102,60 @@ def get(
     params: dict[str, Any] | None = None,
     session: requests.Session | None = None,
 ) -> requests.Response:
-    """GET with retry/backoff. Raises NetworkError on final failure."""
-    client = session or requests.Session()
-    last_exc: Exception | None = None
+    """GET with retry/backoff. Raises NetworkError on final failure.
 
-    for attempt in range(retries):
+    *retries* is the total number of attempts.  Retries come from the shared
+    session's adapter; a caller-supplied *session* retries only if it has its
+    own adapter configured.
+    """
+    client = session or shared_session(retries)
+    try:
+        resp = client.get(url, timeout=timeout, headers=headers, params=params)
+        resp.raise_for_status()
+        return resp
+    except requests.exceptions.HTTPError as exc:
+        status = exc.response.status_code if exc.response is not None else "?"
+        logger.warning("HTTP %s after retries: %s", status, url)
+        raise NetworkError(f"Failed to GET {url}: {exc}") from exc
+    except requests.exceptions.RequestException as exc:
+        logger.warning("Request failed after retries: %s (%s)", url, exc)
+        raise NetworkError(f"Failed to GET {url}: {exc}") from exc
+
+
+def get_many(
+    urls: Sequence[str],
+    *,
+    params: Sequence[dict[str, Any] | None] | None = None,
+    max_workers: int = 8,
+    return_exceptions: bool = False,
+    **kwargs: Any,
+) -> list[requests.Response | NetworkError]:
+    """``get`` each URL on a thread pool; results come back in input order.
+
+    *params*, if given, pairs one query dict with each URL.  With
+    *return_exceptions* a failed URL yields its :class:`NetworkError` in place
+    instead of raising, so callers can skip individual failures.
+    """
+    if params is None:
+        params = [None] * len(urls)
+    if len(params) != len(urls):
+        raise ValueError("params must pair one entry with each URL")
+    if not urls:
+        return []
+
+    def _one(url: str, p: dict[str, Any] | None) -> requests.Response | NetworkError:
         try:
-            resp = client.get(url, timeout=timeout, headers=headers, params=params)
-            resp.raise_for_status()
-            return resp
-        except requests.exceptions.Timeout as exc:
-            last_exc = exc
-            logger.warning("Timeout on attempt %d/%d: %s", attempt + 1, retries, url)
-        except requests.exceptions.ConnectionError as exc:
-            last_exc = exc
-            logger.warning("Connection error on attempt %d/%d: %s", attempt + 1, retries, url)
-        except requests.exceptions.HTTPError as exc:
-            last_exc = exc
-            logger.warning(
-                "HTTP %s on attempt %d/%d: %s",
-                exc.response.status_code if exc.response is not None else "?",
-                attempt + 1,
-                retries,
-                url,
-            )
-
-        if attempt < retries - 1:
-            wait = _backoff(attempt)
-            logger.debug("Backing off %.1fs before retry…", wait)
-            time.sleep(wait)
-
-    raise NetworkError(f"Failed to GET {url} after {retries} attempts: {last_exc}") from last_exc
+            return get(url, params=p, **kwargs)
+        except NetworkError as exc:
+            if return_exceptions:
+                return exc
+            raise
+
+    # More threads than pooled connections would just queue on the adapter.
+    workers = max(1, min(max_workers, len(urls), POOL_MAXSIZE))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-get") as pool:
+        futures = [pool.submit(_one, u, p) for u, p in zip(urls, params)]
+        return [f.result() for f in futures]
 
 
 def download_text(url: str, **kwargs: Any) -> str:
@@ -4,15 +4,20 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-_RATE_FREE = re.compile(r"^\s*free\s*$", re.IGNORECASE)
-_RATE_PERCENT = re.compile(r"^\s*([\d]+(?:\.[\d]+)?)\s*%\s*")
+# "Free" (group 1) or a leading "<number>%" (group 2) in one scan.  The percent
+# branch is unanchored at the end so "5% + 2¢/kg" still yields 5.0.
+_RATE = re.compile(r"^\s*(?:(free)\s*$|(\d+(?:\.\d+)?)\s*%)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
 
 
+@lru_cache(maxsize=65536)
 def normalize_hts_code(raw: str | None) -> str | None:
     """
     Normalise an HTS code string for consistent comparison and prefix matching.
@@ -25,9 +30,14 @@ def normalize_hts_code(raw: str | None) -> str | None:
     - ``"01012100"``      → ``"01012100"``    (8-digit prefix)
     - ``"0101.21"``       → ``"010121"``      (6-digit chapter/heading prefix)
 
+    Results are memoised: request paths normalise the same codes repeatedly.
+
     Returns:
         Cleaned digit string, or ``None`` for empty / NaN input.
     """
+    # Already-clean codes (the usual case from internal callers) pass through.
+    if isinstance(raw, str) and raw.isdigit():
+        return raw
     if raw is None or (isinstance(raw, float) and pd.isna(raw)):
         return None
     cleaned = str(raw).replace(".", "").replace(" ", "").strip()
@@ -45,22 +55,64 @@ def parse_rate(raw: str | None) -> float | None:
     """
     if raw is None or (isinstance(raw, float) and pd.isna(raw)):
         return None
-    s = str(raw).strip()
-    if not s:
+    m = _RATE.match(str(raw))
+    if m is None:
         return None
-    if _RATE_FREE.match(s):
-        return 0.0
-    m = _RATE_PERCENT.match(s)
-    if m:
-        return float(m.group(1))
-    return None
+    return 0.0 if m.group(1) else float(m.group(2))
 
 
 def clean_description(raw: str | None) -> str | None:
     """Collapse multiple whitespace characters into single spaces."""
     if raw is None or (isinstance(raw, float) and pd.isna(raw)):
         return None
-    return re.sub(r"\s+", " ", str(raw)).strip()
+    return _WHITESPACE.sub(" ", str(raw)).strip()
+
+
+_RATE_COLUMNS = ("rate_general_raw", "rate_special_raw", "rate_column2_raw")
+
+
+def _parse_categories(cat: pd.Series) -> pd.Series:
+    """Apply :func:`parse_rate` to a categorical column, once per category."""
+    m = pd.Series(cat.cat.categories.astype(str)).str.extract(_RATE)
+    parsed = np.where(m[0].notna(), 0.0, m[1].astype(float).to_numpy())
+    # Code -1 (missing) indexes the trailing NaN.
+    parsed = np.append(parsed, np.nan)
+    return pd.Series(parsed[cat.cat.codes.to_numpy()], index=cat.index)
+
+
+def _arrow_string_dtype() -> pd.StringDtype | None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    return pd.StringDtype("pyarrow")
+
+
+# Arrow-backed strings (the "fast" extra) keep codes and descriptions in
+# contiguous UTF-8 buffers and run .str ops in Arrow kernels; without pyarrow
+# the columns stay plain Python strings.
+_STRING_DTYPE = _arrow_string_dtype()
+
+
+# Column-wise equivalents of normalize_hts_code / clean_description: the same
+# transforms through the .str accessor instead of a Python call per cell.
+# Missing input stays missing (NaN, or <NA> with Arrow strings, rather than None).
+
+def _normalize_hts_column(col: pd.Series) -> pd.Series:
+    present = col.notna()
+    cleaned = (
+        col[present].astype(_STRING_DTYPE or str)
+        .str.replace(".", "", regex=False)
+        .str.replace(" ", "", regex=False)
+        .str.strip()
+    )
+    return cleaned.where(cleaned != "").reindex(col.index)
+
+
+def _clean_description_column(col: pd.Series) -> pd.Series:
+    present = col.notna()
+    cleaned = col[present].astype(_STRING_DTYPE or str).str.replace(_WHITESPACE, " ", regex=True).str.strip()
+    return cleaned.reindex(col.index)
 
 
 def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -68,15 +120,22 @@ def normalize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
     if "hts_code" in df.columns:
-        df["hts_code"] = df["hts_code"].apply(normalize_hts_code)
+        df["hts_code"] = _normalize_hts_column(df["hts_code"])
 
     if "description" in df.columns:
-        df["description"] = df["description"].apply(clean_description)
+        df["description"] = _clean_description_column(df["description"])
 
-    for rate_col in ("rate_general_raw", "rate_special_raw", "rate_column2_raw"):
+    for rate_col in _RATE_COLUMNS:
         parsed_col = rate_col.replace("_raw", "_value")
         if rate_col in df.columns:
-            df[parsed_col] = df[rate_col].apply(parse_rate)
+            # A full table has ~30k rows but only a few hundred distinct rate
+            # strings: store them as categories and parse each one once.
+            cat = df[rate_col].astype("category")
+            df[rate_col] = cat
+            df[parsed_col] = _parse_categories(cat)
+
+    if "additional_duties_raw" in df.columns:
+        df["additional_duties_raw"] = df["additional_duties_raw"].astype("category")
 
     # Drop rows where hts_code is None (header artefacts etc.)
     df = df.loc[df["hts_code"].notna()].reset_index(drop=True)
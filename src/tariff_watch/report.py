@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import heapq
+import io
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
+import orjson
 from dateutil import tz
 
 logger = logging.getLogger(__name__)
@@ -35,31 +37,37 @@ def _now_local(timezone_str: str) -> datetime:
 def _top_changes(changes: list[dict[str, Any]], n: int = 3) -> list[dict[str, Any]]:
     """Return up to n changes prioritising rate changes, then added/removed."""
     priority = {"changed_rate_general": 0, "added": 1, "removed": 2, "changed_description": 3}
-    return sorted(changes, key=lambda c: priority.get(c["change_type"], 99))[:n]
+    # Same result as sorted(...)[:n] (ties keep input order) without sorting every change.
+    return heapq.nsmallest(n, changes, key=lambda c: priority.get(c["change_type"], 99))
 
 
-def _md_table(changes: list[dict[str, Any]]) -> str:
+def _write_md_table(out: TextIO, changes: list[dict[str, Any]]) -> None:
     if not changes:
-        return "_No changes detected._\n"
-    header = "| HTS Code | Change Type | Old Value | New Value |\n"
-    separator = "|---|---|---|---|\n"
-    rows = []
+        out.write("_No changes detected._\n")
+        return
+    out.write("| HTS Code | Change Type | Old Value | New Value |\n")
+    out.write("|---|---|---|---|\n")
     for c in changes:
         ct = _CHANGE_TYPE_LABELS.get(c["change_type"], c["change_type"])
         old = str(c.get("old_raw") or c.get("old_value") or "—")
         new = str(c.get("new_raw") or c.get("new_value") or "—")
-        rows.append(f"| `{c['hts_code']}` | {ct} | {old} | {new} |")
-    return header + separator + "\n".join(rows) + "\n"
+        out.write(f"| `{c['hts_code']}` | {ct} | {old} | {new} |\n")
 
 
-def generate_markdown_report(
+def write_markdown_report(
+    out: TextIO,
     changes: list[dict[str, Any]],
     run_date_str: str,
     source_url: str,
     mode: str,
     tracked_hts: list[str],
     timezone_str: str = "America/Los_Angeles",
-) -> str:
+) -> None:
+    """Write the Markdown report to *out* piece by piece.
+
+    The change table is emitted row by row, so a large report is never held
+    in memory as one string.
+    """
     top = _top_changes(changes)
     highlights = []
     for c in top:
@@ -75,7 +83,7 @@ def generate_markdown_report(
 
     highlights_md = "\n".join(highlights) if highlights else "- No significant changes this week."
 
-    return f"""# Tariff Watch — Weekly Update
+    out.write(f"""# Tariff Watch — Weekly Update
 
 **Date:** {run_date_str} ({timezone_str})
 **Mode:** {mode}
@@ -91,7 +99,9 @@ def generate_markdown_report(
 
 ## 🔍 Detailed Changes
 
-{_md_table(changes)}
+""")
+    _write_md_table(out, changes)
+    out.write(f"""
 
 ---
 
@@ -102,7 +112,20 @@ def generate_markdown_report(
 ---
 
 **Source:** {source_url or '_not configured_'}
-"""
+""")
+
+
+def generate_markdown_report(
+    changes: list[dict[str, Any]],
+    run_date_str: str,
+    source_url: str,
+    mode: str,
+    tracked_hts: list[str],
+    timezone_str: str = "America/Los_Angeles",
+) -> str:
+    buf = io.StringIO()
+    write_markdown_report(buf, changes, run_date_str, source_url, mode, tracked_hts, timezone_str)
+    return buf.getvalue()
 
 
 def generate_json_report(
@@ -182,9 +205,6 @@ def write_reports(
     date_str = now.strftime("%Y-%m-%d")
     file_stem = f"report_{now.strftime('%Y%m%d')}"
 
-    md_content = generate_markdown_report(
-        changes, date_str, source_url, mode, tracked_hts, timezone_str
-    )
     json_content = generate_json_report(
         changes, date_str, source_url, mode, tracked_hts, timezone_str
     )
@@ -192,8 +212,15 @@ def write_reports(
     md_path = reports_dir / f"{file_stem}.md"
     json_path = reports_dir / f"{file_stem}.json"
 
-    md_path.write_text(md_content, encoding="utf-8")
-    json_path.write_text(json.dumps(json_content, indent=2, default=str), encoding="utf-8")
+    with md_path.open("w", encoding="utf-8", buffering=1 << 20) as fh:
+        write_markdown_report(fh, changes, date_str, source_url, mode, tracked_hts, timezone_str)
+    json_path.write_bytes(
+        orjson.dumps(
+            json_content,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC,
+            default=str,
+        )
+    )
 
     logger.info("Report written: %s", md_path)
     logger.info("Report written: %s", json_path)
@@ -132,13 +132,15 @@ def _job_refresh_usitc() -> None:
     """Refresh USITC tariff data (weekly)."""
     try:
         from .sources_usitc import fetch_hts_dataframe
-        from .db import upsert_snapshots
+        from .db import analyze_snapshots, refresh_current_rates, upsert_snapshots
         from datetime import date as dt_date
 
         df = fetch_hts_dataframe()
         if df is not None and not df.empty:
             rows = df.to_dict("records")
             count = upsert_snapshots(rows, dt_date.today().isoformat())
+            analyze_snapshots()
+            refresh_current_rates()
             logger.info("Scheduler: USITC refresh completed — %d rows", count)
     except Exception as e:
         logger.error("Scheduler: USITC refresh failed — %s", e, exc_info=True)
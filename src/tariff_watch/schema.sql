@@ -21,8 +21,28 @@ CREATE TABLE IF NOT EXISTS hts_snapshots (
 
 CREATE INDEX IF NOT EXISTS idx_hts_snapshots_code ON hts_snapshots (hts_code);
 CREATE INDEX IF NOT EXISTS idx_hts_snapshots_date ON hts_snapshots (snapshot_date);
+-- Per-code history lookups.  Key columns only: INCLUDEing the unbounded TEXT
+-- columns can push an index row past the btree size limit and abort a load.
+DROP INDEX IF EXISTS idx_hts_snapshots_code_date_incl;
 CREATE INDEX IF NOT EXISTS idx_hts_snapshots_code_date ON hts_snapshots (hts_code, snapshot_date DESC);
 
+-- ── Current rates ────────────────────────────────────────────────────────────
+-- Latest snapshot row per code, so /tariff/{hts} scans one row per code instead
+-- of every snapshot.  Refreshed (CONCURRENTLY, hence the unique index) after
+-- each snapshot load.
+CREATE MATERIALIZED VIEW IF NOT EXISTS current_rates AS
+    SELECT DISTINCT ON (hts_code)
+        snapshot_date, hts_code, description,
+        rate_general_raw, rate_general_value,
+        rate_special_raw, rate_special_value,
+        rate_column2_raw, rate_column2_value,
+        additional_duties_raw
+    FROM hts_snapshots
+    ORDER BY hts_code, snapshot_date DESC;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_current_rates_code ON current_rates (hts_code);
+CREATE INDEX IF NOT EXISTS idx_current_rates_code_prefix ON current_rates (hts_code text_pattern_ops);
+
 -- ── Detected rate changes ────────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS rate_changes (
     id           BIGSERIAL PRIMARY KEY,
@@ -37,7 +57,10 @@ CREATE TABLE IF NOT EXISTS rate_changes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_rate_changes_code ON rate_changes (hts_code);
-CREATE INDEX IF NOT EXISTS idx_rate_changes_date ON rate_changes (detected_at DESC);
+-- Matches the /changes ORDER BY so the LIMIT is served by an index range scan;
+-- supersedes the old detected_at-only index.
+DROP INDEX IF EXISTS idx_rate_changes_date;
+CREATE INDEX IF NOT EXISTS idx_rate_changes_date_code ON rate_changes (detected_at DESC, hts_code);
 
 -- ── Federal Register notices ─────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS federal_register_notices (
@@ -2,46 +2,362 @@
 
 from __future__ import annotations
 
+import csv
+import gzip
+import io
 import logging
-import re
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator
 
-import pandas as pd
+# pandas is imported where frames are read; listing and retention (the
+# cron-only paths) never need it.
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
-_SNAPSHOT_RE = re.compile(r"hts_snapshot_(\d{8})\.csv$")
+_PREFIX = "hts_snapshot_"
+_SUFFIX = ".csv.gz"
+# Snapshots written before compression was introduced; still listed and
+# loaded until retention ages them out.
+_LEGACY_SUFFIX = ".csv"
+_DATE_START = len(_PREFIX)
+_DATE_END = _DATE_START + 8
+
+# With pyarrow installed each snapshot also gets a Parquet copy next to it.
+# The CSV stays the listed, interchange copy; load_snapshot reads the Parquet
+# one when present (dictionary-encoded columns, no per-cell parsing).
+_PARQUET_SUFFIX = ".parquet"
+
+# Snapshots are written once and read back rarely; level 1 gets most of the
+# size reduction on this highly repetitive text for little CPU.
+_GZIP_LEVEL = 1
+
+
+def _is_snapshot_name(name: str) -> bool:
+    """``hts_snapshot_YYYYMMDD.csv[.gz]``, checked with plain string compares."""
+    return (
+        name.startswith(_PREFIX)
+        and name[_DATE_END:] in (_SUFFIX, _LEGACY_SUFFIX)
+        and name[_DATE_START:_DATE_END].isdecimal()
+    )
+
+
+def _date_key(name: str) -> int:
+    """YYYYMMDD of a snapshot filename as an int (names are fixed-width)."""
+    return int(name[_DATE_START:_DATE_END])
+
+
+@lru_cache(maxsize=64)
+def _fmt_ymd(d: date) -> str:
+    # save/find/retention in one run all format the same date.
+    return d.strftime("%Y%m%d")
+
+
+def _ymd_int(d: date) -> int:
+    """*d* as the integer :func:`_date_key` returns for its snapshot name."""
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _is_year_name(name: str) -> bool:
+    return len(name) == 4 and name.isdecimal()
 
 
 def _snapshot_path(snapshots_dir: Path, run_date: date) -> Path:
-    return snapshots_dir / f"hts_snapshot_{run_date.strftime('%Y%m%d')}.csv"
+    # One subdirectory per year keeps each directory scan small however long
+    # the archive grows.  Snapshots saved before partitioning sit directly in
+    # snapshots_dir and are still listed.
+    return (
+        snapshots_dir / f"{run_date.year:04d}"
+        / f"{_PREFIX}{_fmt_ymd(run_date)}{_SUFFIX}"
+    )
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table | None:
+    """*df* as an Arrow table, or None without pyarrow (the "fast" extra)."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns that Arrow cannot infer a type for.
+        return None
+
+
+def _write_csv(df: pd.DataFrame, table: pa.Table | None, fh: BinaryIO) -> None:
+    # pyarrow formats whole columns in C; pandas.to_csv formats cell by cell
+    # in Python.  Both write UTF-8, comma-separated, LF.
+    if table is None:
+        df.to_csv(fh, index=False)
+        return
+    import pyarrow.csv as pacsv
+
+    pacsv.write_csv(
+        table, fh,
+        write_options=pacsv.WriteOptions(include_header=True, batch_size=8192),
+    )
+
+
+def _parquet_path(path: Path) -> Path:
+    return path.with_name(path.name[:_DATE_END] + _PARQUET_SUFFIX)
+
+
+# Directories already created by this process; saves skip the mkdir syscall.
+_ENSURED_DIRS: set[Path] = set()
+
+
+def _ensure_dir(directory: Path) -> None:
+    if directory not in _ENSURED_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(directory)
+
+
+# Buffer on both sides of the compressor: CSV writers hand over many small
+# chunks, and the compressed stream is written out in few large syscalls.
+_WRITE_BUFFER = 1 << 20
+
+
+def _create(path: Path) -> BinaryIO:
+    try:
+        return open(path, "wb", buffering=_WRITE_BUFFER)
+    except FileNotFoundError:
+        # The directory was removed after it was first ensured.
+        _ENSURED_DIRS.discard(path.parent)
+        _ensure_dir(path.parent)
+        return open(path, "wb", buffering=_WRITE_BUFFER)
+
+
+@contextmanager
+def _open_snapshot(path: Path, name: str) -> Iterator[BinaryIO]:
+    """Open *path* for writing gzip data whose header records *name*."""
+    with (
+        _create(path) as raw,
+        gzip.GzipFile(filename=name, mode="wb", compresslevel=_GZIP_LEVEL, fileobj=raw) as gz,
+        io.BufferedWriter(gz, _WRITE_BUFFER) as fh,
+    ):
+        yield fh
+
+
+def _replace_atomically(path: Path, write: Callable[[Path], None]) -> None:
+    # Written under a temporary name and renamed into place, so a crashed
+    # run never leaves a truncated file that list_snapshots would pick up.
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _as_strings(table: pa.Table) -> pa.Table:
+    """*table* with every column cast to Arrow strings.
+
+    Arrow's cast formats values exactly as its CSV writer does, so a Parquet
+    copy of the cast table holds the same text as the CSV snapshot.
+    """
+    import pyarrow as pa
+
+    if all(t == pa.string() for t in table.schema.types):
+        return table
+    return table.cast(pa.schema([pa.field(name, pa.string()) for name in table.column_names]))
+
+
+def _write_parquet(table: pa.Table, path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    table = _as_strings(table)
+
+    def write(tmp: Path) -> None:
+        with _create(tmp) as fh:
+            pq.write_table(
+                table, fh, compression="zstd", use_dictionary=True, row_group_size=200_000,
+            )
+
+    _replace_atomically(path, write)
 
 
 def save_snapshot(df: pd.DataFrame, snapshots_dir: str | Path, run_date: date | None = None) -> Path:
-    """Persist DataFrame as a dated CSV snapshot. Returns the written path."""
+    """Persist DataFrame as a dated, gzip-compressed CSV snapshot. Returns the written path.
+
+    With pyarrow installed a Parquet copy is written alongside for fast reloads.
+    """
     if run_date is None:
         run_date = date.today()
     snapshots_dir = Path(snapshots_dir)
-    snapshots_dir.mkdir(parents=True, exist_ok=True)
     path = _snapshot_path(snapshots_dir, run_date)
-    df.to_csv(path, index=False)
+    _ensure_dir(path.parent)
+    table = _arrow_table(df)
+    parquet = _parquet_path(path)
+    # A same-day re-run must not leave an older Parquet copy shadowing it.
+    parquet.unlink(missing_ok=True)
+
+    def write_csv(tmp: Path) -> None:
+        with _open_snapshot(tmp, path.name) as fh:
+            _write_csv(df, table, fh)
+
+    _replace_atomically(path, write_csv)
+    if table is not None:
+        try:
+            _write_parquet(table, parquet)
+        except OSError as exc:
+            # The CSV is authoritative; loads fall back to it.
+            logger.warning("Parquet copy of %s not written: %s", path.name, exc)
+    # A same-day re-run replaces any unpartitioned snapshot for that date.
+    for suffix in (_SUFFIX, _LEGACY_SUFFIX):
+        (snapshots_dir / (path.name[:_DATE_END] + suffix)).unlink(missing_ok=True)
+    _scan_dir.cache_clear()
     logger.info("Snapshot saved: %s (%d rows)", path, len(df))
     return path
 
 
+# pandas' default NA markers, so both readers agree on which cells are missing.
+_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+
+def _read_header(path: Path) -> list[str]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", newline="") as fh:
+        return next(csv.reader(fh), [])
+
+
+def _text_frame(table: pa.Table) -> pd.DataFrame:
+    """Convert an all-string Arrow table to the frame ``read_csv(dtype=str)`` gives."""
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    # pandas' default string dtype: ``str`` on pandas 3, object on pandas 2.
+    text = pd.Series(dtype=str).dtype
+    if isinstance(text, pd.StringDtype):
+        return table.to_pandas(types_mapper={pa.string(): text}.get)
+    df = table.to_pandas()
+    # Arrow nulls arrive as None in object columns; read_csv uses NaN.
+    return df.where(df.notna(), np.nan)
+
+
 def load_snapshot(path: str | Path) -> pd.DataFrame:
-    """Load a snapshot CSV as a DataFrame."""
-    return pd.read_csv(Path(path), dtype=str, low_memory=False)
+    """Load a snapshot CSV (plain or gzip-compressed) as a DataFrame.
+
+    Every column comes back as text in pandas' default string dtype (what
+    ``read_csv(dtype=str)`` returns), with NaN for missing cells, whichever
+    reader is used.  With pyarrow installed the snapshot's Parquet copy is
+    read when one exists, otherwise Arrow's CSV reader parses the file;
+    without pyarrow pandas parses it.
+    """
+    import pandas as pd
+
+    path = Path(path)
+    # Both readers map the file rather than copying it through a read
+    # buffer; compressed snapshots are inflated straight from the mapping.
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(path, dtype=str, low_memory=False, memory_map=True)
+    if _is_snapshot_name(path.name):
+        parquet = _parquet_path(path)
+        try:
+            import pyarrow.parquet as pq
+
+            # Copies written before they were stored as text are cast here.
+            return _text_frame(_as_strings(pq.read_table(parquet, memory_map=True)))
+        except FileNotFoundError:
+            pass
+    # Every column is read as text: type inference would turn HTS codes into
+    # integers and drop their leading zeros.
+    convert = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in _read_header(path)},
+        null_values=_NA_VALUES,
+        strings_can_be_null=True,
+    )
+    with pa.memory_map(str(path)) as mapped:
+        source = pa.CompressedInputStream(mapped, "gzip") if path.suffix == ".gz" else mapped
+        table = pacsv.read_csv(
+            source,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=convert,
+        )
+    return _text_frame(table)
+
+
+@lru_cache(maxsize=32)
+def _scan_dir(
+    directory: Path, mtime_ns: int, size: int,
+) -> tuple[tuple[str, ...], tuple[Path, ...]]:
+    # Keyed on the directory's mtime/size so changes made by other processes
+    # are picked up.  That alone is not reliable (directory size rarely moves,
+    # and coarse or network filesystems may not bump mtime within a tick), so
+    # save_snapshot and apply_retention also clear the cache after writing.
+    years: list[str] = []
+    names: list[str] = []
+    with os.scandir(directory) as it:
+        # Filter and sort bare names; Paths are built only for the matches.
+        for e in it:
+            if _is_snapshot_name(e.name) and e.is_file():
+                names.append(e.name)
+            elif _is_year_name(e.name) and e.is_dir():
+                years.append(e.name)
+    years.sort()
+    # Fixed prefix + fixed-width date: plain string order is date order, and
+    # sorting without a key function stays entirely in C.
+    names.sort()
+    return tuple(years), tuple(directory / n for n in names)
+
+
+def _listing(directory: Path) -> tuple[tuple[str, ...], tuple[Path, ...]]:
+    st = directory.stat()
+    return _scan_dir(directory, st.st_mtime_ns, st.st_size)
+
+
+def iter_snapshots(snapshots_dir: str | Path, newest_first: bool = False) -> Iterator[Path]:
+    """Yield snapshot paths in date order (oldest-first unless *newest_first*).
+
+    Year directories are listed only as the iteration reaches them, so a
+    caller that stops early never scans older years.
+    """
+    snapshots_dir = Path(snapshots_dir)
+    try:
+        years, flat = _listing(snapshots_dir)
+    except FileNotFoundError:
+        return
+    if flat and years:
+        # Unpartitioned files can interleave with any year: merge them all.
+        paths = list(flat)
+        for year in years:
+            try:
+                paths.extend(_listing(snapshots_dir / year)[1])
+            except FileNotFoundError:
+                continue
+        paths.sort(key=lambda p: _date_key(p.name))
+        yield from reversed(paths) if newest_first else paths
+        return
+    if flat:
+        yield from reversed(flat) if newest_first else flat
+        return
+    for year in reversed(years) if newest_first else years:
+        try:
+            in_year = _listing(snapshots_dir / year)[1]
+        except FileNotFoundError:
+            continue
+        yield from reversed(in_year) if newest_first else in_year
 
 
 def list_snapshots(snapshots_dir: str | Path) -> list[Path]:
     """Return all snapshot paths sorted oldest-first."""
-    snapshots_dir = Path(snapshots_dir)
-    if not snapshots_dir.exists():
-        return []
-    paths = [p for p in snapshots_dir.iterdir() if _SNAPSHOT_RE.match(p.name)]
-    return sorted(paths, key=lambda p: p.name)
+    return list(iter_snapshots(snapshots_dir))
 
 
 def find_previous_snapshot(snapshots_dir: str | Path, current_date: date | None = None) -> Path | None:
@@ -49,25 +365,55 @@ def find_previous_snapshot(snapshots_dir: str | Path, current_date: date | None
     Return the most recent snapshot that is older than current_date.
     If current_date is None, returns the second-to-last snapshot (treating the last as current).
     """
-    all_snaps = list_snapshots(snapshots_dir)
-    if not all_snaps:
-        return None
-
+    # Walk back from the newest snapshot; the answer is normally in the
+    # current year's directory, one or two entries in.
+    newest = iter_snapshots(snapshots_dir, newest_first=True)
     if current_date is None:
-        # Return second-to-last if available
-        return all_snaps[-2] if len(all_snaps) >= 2 else None
+        next(newest, None)
+        return next(newest, None)
+
+    target = _ymd_int(current_date)
+    return next((p for p in newest if _date_key(p.name) < target), None)
 
-    target = f"hts_snapshot_{current_date.strftime('%Y%m%d')}.csv"
-    before = [p for p in all_snaps if p.name < target]
-    return before[-1] if before else None
+
+def _remove_snapshot(path: Path) -> None:
+    os.unlink(path)
+    _parquet_path(path).unlink(missing_ok=True)
+
+
+# Steady state deletes one or two files a run; not worth starting a pool.
+_PARALLEL_UNLINK_MIN = 4
 
 
 def apply_retention(snapshots_dir: str | Path, retain_weeks: int = 12) -> list[Path]:
     """Delete oldest snapshots beyond retain_weeks*2 quota. Returns deleted paths."""
     max_snapshots = max(retain_weeks * 2, 2)
     all_snaps = list_snapshots(snapshots_dir)
-    to_delete = all_snaps[:-max_snapshots] if len(all_snaps) > max_snapshots else []
-    for p in to_delete:
-        p.unlink()
-        logger.info("Deleted old snapshot: %s", p)
+    # Steady state: within quota, nothing to do.  Otherwise the (cached,
+    # already ordered) listing gives the oldest snapshots as a plain prefix.
+    excess = len(all_snaps) - max_snapshots
+    if excess <= 0:
+        return []
+    to_delete = all_snaps[:excess]
+    try:
+        if len(to_delete) > _PARALLEL_UNLINK_MIN:
+            # A large purge (e.g. after lowering retain_weeks): overlap the
+            # unlink syscalls, which release the GIL.
+            with ThreadPoolExecutor(max_workers=min(16, len(to_delete))) as pool:
+                list(pool.map(_remove_snapshot, to_delete))
+        else:
+            for p in to_delete:
+                _remove_snapshot(p)
+        for parent in {p.parent for p in to_delete} - {Path(snapshots_dir)}:
+            try:
+                os.rmdir(parent)  # only succeeds once a year directory is empty
+            except OSError:
+                pass
+    finally:
+        # Even a partial purge has changed the listing.
+        _scan_dir.cache_clear()
+    logger.info(
+        "Deleted %d old snapshot(s) (%s … %s)",
+        len(to_delete), to_delete[0].name, to_delete[-1].name,
+    )
     return to_delete
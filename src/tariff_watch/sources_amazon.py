@@ -4,31 +4,14 @@ Uses realistic mock product catalogue + real HTS tariff lookup.
 """
 from __future__ import annotations
 
-import random
+from bisect import bisect_left
 from datetime import date, timedelta
-from typing import Any
-
-_TODAY = date(2026, 2, 24)
-
-
-def _gen_history(base: float, days: int = 30) -> list[dict[str, Any]]:
-    result = []
-    price = base
-    for i in range(days, -1, -1):
-        delta = random.uniform(-0.03, 0.03)
-        price = round(max(base * 0.85, min(base * 1.15, price * (1 + delta))), 2)
-        result.append({"date": (_TODAY - timedelta(days=i)).isoformat(), "price": price})
-    return result
+from functools import lru_cache
+from typing import Any, NamedTuple
 
+import numpy as np
 
-def _gen_bsr_history(base: int, days: int = 30) -> list[dict[str, Any]]:
-    result = []
-    bsr = base
-    for i in range(days, -1, -1):
-        delta = random.uniform(-0.05, 0.05)
-        bsr = max(1, int(bsr * (1 + delta)))
-        result.append({"date": (_TODAY - timedelta(days=i)).isoformat(), "bsr": bsr})
-    return result
+_TODAY = date(2026, 2, 24)
 
 
 _CATALOGUE: list[dict[str, Any]] = [
@@ -88,48 +71,137 @@ _CATALOGUE: list[dict[str, Any]] = [
     {"asin":"B08K4LSJ3F","title":"Turtle Wax 50734 Complete Car Care Kit 10-Piece","brand":"Turtle Wax","category":"Automotive","image":"https://m.media-amazon.com/images/I/81TqjnFAtSL._AC_SX679_.jpg","price":35.99,"rating":4.5,"review_count":16800,"bsr":280,"weight_lbs":5.2,"dimensions_inches":[14.0,10.0,8.0],"hts_code":"3405200000","cog_usd":7.00},
 ]
 
+_HISTORY_DAYS = 30
+_HISTORY_DATES: list[str] = [
+    (_TODAY - timedelta(days=i)).isoformat() for i in range(_HISTORY_DAYS, -1, -1)
+]
+
+
+def _gen_histories(
+    prices: np.ndarray, bsrs: np.ndarray, rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Random-walk price and BSR series for every product at once.
+
+    Each day is one vector step across the whole catalogue: prices move up to
+    ±3% and stay within ±15% of list price (rounded to cents), BSR moves up to
+    ±5% and never drops below 1.  Returns two (n_products, days + 1) arrays.
+    """
+    n, days = len(prices), len(_HISTORY_DATES)
+    price_deltas = 1 + rng.uniform(-0.03, 0.03, size=(n, days))
+    bsr_deltas = 1 + rng.uniform(-0.05, 0.05, size=(n, days))
+    lo, hi = prices * 0.85, prices * 1.15
+    price_hist = np.empty((n, days))
+    bsr_hist = np.empty((n, days), dtype=np.int64)
+    price, bsr = prices.astype(float), bsrs.astype(np.int64)
+    for i in range(days):
+        price = np.round(np.clip(price * price_deltas[:, i], lo, hi), 2)
+        bsr = np.maximum(1, (bsr * bsr_deltas[:, i]).astype(np.int64))
+        price_hist[:, i] = price
+        bsr_hist[:, i] = bsr
+    return price_hist, bsr_hist
+
+
+_PRICE_HIST, _BSR_HIST = _gen_histories(
+    np.array([p["price"] for p in _CATALOGUE], dtype=float),
+    np.array([p["bsr"] for p in _CATALOGUE], dtype=np.int64),
+    np.random.default_rng(),
+)
+
 _PRODUCTS: dict[str, dict[str, Any]] = {}
-for _p in _CATALOGUE:
-    _p["price_history"] = _gen_history(_p["price"])
-    _p["bsr_history"] = _gen_bsr_history(_p["bsr"])
+for _p, _prices, _bsrs in zip(_CATALOGUE, _PRICE_HIST.tolist(), _BSR_HIST.tolist()):
+    _p["price_history"] = [{"date": d, "price": v} for d, v in zip(_HISTORY_DATES, _prices)]
+    _p["bsr_history"] = [{"date": d, "bsr": v} for d, v in zip(_HISTORY_DATES, _bsrs)]
     _PRODUCTS[_p["asin"]] = _p
 
+# 30-day price low/high per product, for get_competitor_data.
+_PRICE_RANGE_30D: dict[str, tuple[float, float]] = dict(zip(
+    _PRODUCTS, zip(_PRICE_HIST.min(axis=1).tolist(), _PRICE_HIST.max(axis=1).tolist()),
+))
+
+
+# Large-standard FBA tiers: flat fee up to each weight limit (lbs), then
+# $0.38/lb over the last limit.
+_FBA_STD_WEIGHT_LIMITS = (1.0, 2.0, 3.0)
+_FBA_STD_FEES = (3.68, 4.75, 5.40)
+
 
 def estimate_fba_fee(weight_lbs: float, dims_inches: list[float]) -> float:
     l, w, h = sorted(dims_inches, reverse=True)
     if weight_lbs <= 1 and l <= 15 and w <= 12 and h <= 0.75:
         return round(3.06 + max(0, weight_lbs - 0.5) * 0.32, 2)
     elif weight_lbs <= 20 and l <= 18 and w <= 14 and h <= 8:
-        if weight_lbs <= 1:
-            return 3.68
-        elif weight_lbs <= 2:
-            return 4.75
-        elif weight_lbs <= 3:
-            return 5.40
-        else:
-            return round(5.40 + (weight_lbs - 3) * 0.38, 2)
+        tier = bisect_left(_FBA_STD_WEIGHT_LIMITS, weight_lbs)
+        if tier < len(_FBA_STD_FEES):
+            return _FBA_STD_FEES[tier]
+        return round(_FBA_STD_FEES[-1] + (weight_lbs - _FBA_STD_WEIGHT_LIMITS[-1]) * 0.38, 2)
     else:
         return round(9.61 + weight_lbs * 0.38, 2)
 
 
+_REFERRAL_RATES = {"Electronics": 0.08, "Sports & Outdoors": 0.15,
+                   "Kitchen & Dining": 0.15, "Tools & Home Improvement": 0.15,
+                   "Toys & Games": 0.15, "Children's Clothing": 0.17,
+                   "Beauty & Personal Care": 0.15, "Automotive": 0.12}
+
+
 def estimate_referral_fee(price: float, category: str) -> float:
-    rates = {"Electronics": 0.08, "Sports & Outdoors": 0.15,
-             "Kitchen & Dining": 0.15, "Tools & Home Improvement": 0.15,
-             "Toys & Games": 0.15, "Children's Clothing": 0.17,
-             "Beauty & Personal Care": 0.15, "Automotive": 0.12}
-    return round(price * rates.get(category, 0.15), 2)
+    return round(price * _REFERRAL_RATES.get(category, 0.15), 2)
 
 
 def estimate_shipping_cost(weight_lbs: float) -> float:
     return round(max(0.8, weight_lbs * 0.453592 * 1.8), 2)
 
 
+class _Fees(NamedTuple):
+    fba: float
+    referral: float
+    shipping: float
+    base_margin_pct: float   # margin at 0% tariff, before customs
+
+
+def _derive_fees(p: dict[str, Any]) -> _Fees:
+    price = p["price"]
+    fba = estimate_fba_fee(p["weight_lbs"], p["dimensions_inches"])
+    referral = estimate_referral_fee(price, p["category"])
+    shipping = estimate_shipping_cost(p["weight_lbs"])
+    margin = (price - p["cog_usd"] - fba - referral - shipping) / price * 100
+    return _Fees(fba, referral, shipping, margin)
+
+
+# Fees depend only on fixed catalogue fields, so they are computed once here
+# rather than on every profit / category request.  Kept out of _PRODUCTS so
+# product payloads returned by the API are unchanged.
+_DERIVED: dict[str, _Fees] = {asin: _derive_fees(p) for asin, p in _PRODUCTS.items()}
+
+# Column arrays over the catalogue (catalogue order) for per-category
+# aggregation with np.bincount.  float64 keeps the sums bit-identical to
+# summing the Python floats in the same order.
+_PRODUCT_LIST: list[dict[str, Any]] = list(_PRODUCTS.values())
+_CATEGORIES: list[str] = sorted({p["category"] for p in _PRODUCT_LIST})
+_CAT_IDS = np.array(
+    [_CATEGORIES.index(p["category"]) for p in _PRODUCT_LIST], dtype=np.intp,
+)
+_PRICE = np.array([p["price"] for p in _PRODUCT_LIST], dtype=np.float64)
+_RATING = np.array([p["rating"] for p in _PRODUCT_LIST], dtype=np.float64)
+_BSR = np.array([p["bsr"] for p in _PRODUCT_LIST], dtype=np.float64)
+_REVIEWS = np.array([p["review_count"] for p in _PRODUCT_LIST], dtype=np.float64)
+_BASE_MARGIN = np.array(
+    [_DERIVED[p["asin"]].base_margin_pct for p in _PRODUCT_LIST], dtype=np.float64,
+)
+
+
+# Lower-cased "title\0brand\0category" per product, built once; the NUL
+# separator stops a keyword matching across two fields.
+_SEARCH_INDEX: list[tuple[str, dict[str, Any]]] = [
+    (f"{p['title']}\0{p['brand']}\0{p['category']}".lower(), p) for p in _PRODUCTS.values()
+]
+
+
 def search_products(keyword: str) -> list[dict[str, Any]]:
     kw = keyword.lower().strip()
     if not kw:
-        return [_summary(p) for p in _PRODUCTS.values()]
-    return [_summary(p) for p in _PRODUCTS.values()
-            if kw in p["title"].lower() or kw in p["brand"].lower() or kw in p["category"].lower()]
+        return list(_ALL_SUMMARIES)
+    return [_summary(p) for blob, p in _SEARCH_INDEX if kw in blob]
 
 
 def get_product(asin: str) -> dict[str, Any] | None:
@@ -155,9 +227,7 @@ def calculate_profit(
         return None
     price = p["price"]
     cog = p["cog_usd"]
-    fba = estimate_fba_fee(p["weight_lbs"], p["dimensions_inches"])
-    referral = estimate_referral_fee(price, p["category"])
-    shipping = estimate_shipping_cost(p["weight_lbs"])
+    fba, referral, shipping, _ = _DERIVED[asin]
     tariff_amount = round(cog * tariff_rate, 2)
 
     # Customs costs amortized per unit
@@ -211,6 +281,7 @@ def get_competitor_data(asin: str) -> dict[str, Any] | None:
     p = _PRODUCTS.get(asin)
     if not p:
         return None
+    low, high = _PRICE_RANGE_30D[asin]
     return {
         "asin": asin,
         "title": p["title"],
@@ -220,13 +291,24 @@ def get_competitor_data(asin: str) -> dict[str, Any] | None:
         "review_count": p["review_count"],
         "price_history": p["price_history"],
         "bsr_history": p["bsr_history"],
-        "price_low_30d": min(x["price"] for x in p["price_history"]),
-        "price_high_30d": max(x["price"] for x in p["price_history"]),
+        "price_low_30d": low,
+        "price_high_30d": high,
     }
 
 
+_SUMMARY_KEYS = ("asin","title","brand","category","image","price","rating","review_count","bsr","hts_code")
+
+# One summary dict per product, built once and shared by every caller:
+# treat as read-only, and copy before adding keys (see get_trending_products).
+_SUMMARIES: dict[str, dict[str, Any]] = {
+    asin: {k: p[k] for k in _SUMMARY_KEYS} for asin, p in _PRODUCTS.items()
+}
+# What an empty search returns: every product.
+_ALL_SUMMARIES: list[dict[str, Any]] = list(_SUMMARIES.values())
+
+
 def _summary(p: dict[str, Any]) -> dict[str, Any]:
-    return {k: p[k] for k in ("asin","title","brand","category","image","price","rating","review_count","bsr","hts_code")}
+    return _SUMMARIES[p["asin"]]
 
 
 # ── Trending Products ─────────────────────────────────────────────────────────
@@ -256,21 +338,40 @@ def _est_monthly_revenue(p: dict[str, Any]) -> float:
     return round(p["price"] * daily_sales * 30, 0)
 
 
+def _trending_fields(p: dict[str, Any]) -> dict[str, Any]:
+    revenue = _est_monthly_revenue(p)
+    return {
+        "trending_score": round(_trending_score(p), 1),
+        "bsr_trend": _bsr_trend(p),
+        "est_monthly_revenue": revenue,
+        "est_monthly_sales": int(revenue / p["price"]),
+    }
+
+
+# Trending inputs never change after import, so the ranking is built once:
+# the full catalogue and each category, best score first (stable for ties),
+# paired with the per-product trending fields.
+_TRENDING_FIELDS: dict[str, dict[str, Any]] = {
+    asin: _trending_fields(p) for asin, p in _PRODUCTS.items()
+}
+_TRENDING_ALL: list[dict[str, Any]] = sorted(_PRODUCTS.values(), key=_trending_score, reverse=True)
+_TRENDING_BY_CAT: dict[str, list[dict[str, Any]]] = {}
+for _p in _TRENDING_ALL:
+    _TRENDING_BY_CAT.setdefault(_p["category"], []).append(_p)
+
+
+# The catalogue is fixed at import, so results are cached per argument set and
+# shared between callers: treat the returned lists as read-only.
+@lru_cache(maxsize=64)
 def get_trending_products(category: str | None = None, limit: int = 15) -> list[dict[str, Any]]:
-    prods = list(_PRODUCTS.values())
     if category and category != "All":
-        prods = [p for p in prods if p["category"] == category]
-    prods.sort(key=_trending_score, reverse=True)
-    result = []
-    for rank, p in enumerate(prods[:limit], 1):
-        summary = _summary(p)
-        summary["rank"] = rank
-        summary["trending_score"] = round(_trending_score(p), 1)
-        summary["bsr_trend"] = _bsr_trend(p)
-        summary["est_monthly_revenue"] = _est_monthly_revenue(p)
-        summary["est_monthly_sales"] = int(summary["est_monthly_revenue"] / p["price"])
-        result.append(summary)
-    return result
+        prods = _TRENDING_BY_CAT.get(category, [])
+    else:
+        prods = _TRENDING_ALL
+    return [
+        {**_summary(p), "rank": rank, **_TRENDING_FIELDS[p["asin"]]}
+        for rank, p in enumerate(prods[:limit], 1)
+    ]
 
 
 # ── Category Stats ────────────────────────────────────────────────────────────
@@ -288,13 +389,13 @@ _CATEGORY_EXTRA: dict[str, dict[str, Any]] = {
     "Automotive":            {"market_size_bn": 11.7, "yoy_growth_pct": 7.1,  "avg_tariff_pct": 2.5},
 }
 
-_COMP_LEVEL = {(1,50): "Very High", (51,200): "High", (201,500): "Medium", (501,9999): "Low"}
+# Average-BSR upper bounds (inclusive) for each competition label; above the
+# last bound competition is "Low".
+_COMP_THRESHOLDS = (50, 200, 500)
+_COMP_LABELS = ("Very High", "High", "Medium", "Low")
 
 def _competition_label(avg_bsr: float) -> str:
-    for (lo, hi), label in _COMP_LEVEL.items():
-        if lo <= avg_bsr <= hi:
-            return label
-    return "Low"
+    return _COMP_LABELS[bisect_left(_COMP_THRESHOLDS, avg_bsr)]
 
 def _opportunity_score(avg_bsr: float, avg_margin: float, yoy: float) -> int:
     score = 50
@@ -304,43 +405,40 @@ def _opportunity_score(avg_bsr: float, avg_margin: float, yoy: float) -> int:
     return min(98, max(10, int(score)))
 
 
+@lru_cache(maxsize=1)
 def get_category_stats() -> list[dict[str, Any]]:
-    from collections import defaultdict
-    groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
-    for p in _PRODUCTS.values():
-        groups[p["category"]].append(p)
+    n_cats = len(_CATEGORIES)
+    counts = np.bincount(_CAT_IDS, minlength=n_cats)
+
+    def _mean(values: np.ndarray) -> np.ndarray:
+        return np.bincount(_CAT_IDS, weights=values, minlength=n_cats) / counts
+
+    avg_prices, avg_ratings = _mean(_PRICE), _mean(_RATING)
+    avg_bsrs, avg_reviews, avg_margins = _mean(_BSR), _mean(_REVIEWS), _mean(_BASE_MARGIN)
 
     result = []
-    for cat, prods in sorted(groups.items()):
-        avg_price = round(sum(p["price"] for p in prods) / len(prods), 2)
-        avg_rating = round(sum(p["rating"] for p in prods) / len(prods), 2)
-        avg_bsr = round(sum(p["bsr"] for p in prods) / len(prods), 0)
-        avg_reviews = int(sum(p["review_count"] for p in prods) / len(prods))
+    for i, cat in enumerate(_CATEGORIES):
+        avg_bsr = round(float(avg_bsrs[i]), 0)
         # Rough margin estimate at 0% tariff
-        margins = []
-        for p in prods:
-            cog = p["cog_usd"]
-            fba = estimate_fba_fee(p["weight_lbs"], p["dimensions_inches"])
-            ref = estimate_referral_fee(p["price"], p["category"])
-            ship = estimate_shipping_cost(p["weight_lbs"])
-            margins.append((p["price"] - cog - fba - ref - ship) / p["price"] * 100)
-        avg_margin = round(sum(margins) / len(margins), 1)
+        avg_margin = round(float(avg_margins[i]), 1)
         extra = _CATEGORY_EXTRA.get(cat, {"market_size_bn": 3.0, "yoy_growth_pct": 5.0, "avg_tariff_pct": 3.5})
         yoy = extra["yoy_growth_pct"]
+        members = np.flatnonzero(_CAT_IDS == i)
+        top = members[np.argsort(_BSR[members], kind="stable")[:3]]
         result.append({
             "category": cat,
-            "product_count": len(prods),
-            "avg_price": avg_price,
-            "avg_rating": avg_rating,
+            "product_count": int(counts[i]),
+            "avg_price": round(float(avg_prices[i]), 2),
+            "avg_rating": round(float(avg_ratings[i]), 2),
             "avg_bsr": int(avg_bsr),
-            "avg_review_count": avg_reviews,
+            "avg_review_count": int(avg_reviews[i]),
             "avg_margin_pct": avg_margin,
             "competition_level": _competition_label(avg_bsr),
             "opportunity_score": _opportunity_score(avg_bsr, avg_margin, yoy),
             "market_size_bn": extra["market_size_bn"],
             "yoy_growth_pct": yoy,
             "avg_tariff_pct": extra["avg_tariff_pct"],
-            "top_products": [_summary(p) for p in sorted(prods, key=lambda x: x["bsr"])[:3]],
+            "top_products": [_summary(_PRODUCT_LIST[j]) for j in top],
         })
     # sort by opportunity_score desc
     result.sort(key=lambda x: x["opportunity_score"], reverse=True)
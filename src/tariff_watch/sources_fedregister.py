@@ -6,7 +6,7 @@ import logging
 from datetime import date, timedelta
 from typing import Any
 
-from .http import NetworkError, ParseError, get as http_get
+from .http import NetworkError, ParseError, get_many
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +47,8 @@ def fetch_notices(
 
     results: list[dict[str, Any]] = []
 
-    for agency in agencies:
-        params = {
+    queries = [
+        {
             "conditions[agencies][]": agency,
             "conditions[publication_date][gte]": since.isoformat(),
             "conditions[type][]": ["NOTICE", "RULE", "PRORULE"],
@@ -63,12 +63,19 @@ def fetch_notices(
             "per_page": per_page,
             "order": "newest",
         }
+        for agency in agencies
+    ]
+    # One request per agency, issued concurrently; results keep agency order.
+    responses = get_many(
+        [_FR_API] * len(queries), params=queries, timeout=15, return_exceptions=True,
+    )
+
+    for agency, resp in zip(agencies, responses):
+        if isinstance(resp, NetworkError):
+            logger.warning("Federal Register fetch failed for agency %s: %s", agency, resp)
+            continue
         try:
-            resp = http_get(_FR_API, params=params, timeout=15)
             data = resp.json()
-        except NetworkError as exc:
-            logger.warning("Federal Register fetch failed for agency %s: %s", agency, exc)
-            continue
         except Exception as exc:
             raise ParseError(f"Federal Register response parse error: {exc}") from exc
 
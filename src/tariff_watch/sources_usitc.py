@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import csv
 import io
 import logging
 import re
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 import pandas as pd
+import requests
 
 from .config import AppConfig, ConfigError
 from .http import NetworkError, ParseError, download_text, get as http_get
@@ -24,7 +27,11 @@ _RELEASE_LIST_URL = "https://hts.usitc.gov/reststop/releaseList"
 _CSV_URL_TEMPLATE = "https://www.usitc.gov/tata/hts/hts_{year}_revision_{rev}_csv.csv"
 
 
-def discover_usitc_csv_url() -> str | None:
+# Expected release names: "2026HTSRev3" or "2026HTSBasic".
+_RELEASE_NAME_RE = re.compile(r"(\d{4})HTS(?:Rev(\d+)|Basic)")
+
+
+def discover_usitc_csv_url(session: requests.Session | None = None) -> str | None:
     """Auto-discover the latest USITC HTS CSV export URL.
 
     Calls ``/reststop/releaseList`` on hts.usitc.gov to find the release
@@ -36,7 +43,7 @@ def discover_usitc_csv_url() -> str | None:
         fails (network error, unexpected name format, etc.).
     """
     try:
-        resp = http_get(_RELEASE_LIST_URL)
+        resp = http_get(_RELEASE_LIST_URL, session=session)
         releases: list[dict] = resp.json()
     except Exception as exc:
         logger.warning("discover_usitc_csv_url: could not fetch release list: %s", exc)
@@ -51,8 +58,7 @@ def discover_usitc_csv_url() -> str | None:
         return None
 
     name: str = current.get("name", "")
-    # Expected format: "2026HTSRev3"  or  "2026HTSBasic"
-    m = re.match(r"^(\d{4})HTS(?:Rev(\d+)|Basic)$", name)
+    m = _RELEASE_NAME_RE.fullmatch(name)
     if not m:
         logger.warning("discover_usitc_csv_url: unrecognised release name %r", name)
         return None
@@ -105,6 +111,33 @@ _COLUMN_ALIASES: dict[str, str] = {
 }
 
 
+def _read_hts_csv(text: str) -> pd.DataFrame:
+    """Parse a USITC CSV export with every column kept as text.
+
+    Uses pyarrow's multithreaded reader when it is installed (the ``fast``
+    extra) and pandas' C parser otherwise.  All columns are forced to string
+    so HTS codes keep their leading zeros either way.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return pd.read_csv(io.StringIO(text), dtype=str, low_memory=False)
+
+    header = next(csv.reader(io.StringIO(text)), [])
+    table = pa_csv.read_csv(
+        io.BytesIO(text.encode("utf-8")),
+        # Descriptions can hold quoted line breaks; without this the chunker
+        # splits blocks inside them and the parse fails on large exports.
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+
 def _rename_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Normalise column names using known aliases (case-insensitive)."""
     mapping = {
@@ -127,8 +160,7 @@ def filter_tracked_hts(df: pd.DataFrame, tracked_codes: list[str]) -> pd.DataFra
     normalised *tracked_codes* prefixes (supports 8- or 10-digit codes,
     with or without dots).
 
-    A temporary column ``hts_code_norm`` is added then removed so the
-    returned DataFrame keeps the same schema as the input.
+    The input is not modified and the returned DataFrame keeps its schema.
 
     Args:
         df: Normalised HTS DataFrame (must contain an ``hts_code`` column).
@@ -148,18 +180,20 @@ def filter_tracked_hts(df: pd.DataFrame, tracked_codes: list[str]) -> pd.DataFra
         logger.warning("filter_tracked_hts: no valid tracked codes supplied — returning empty DataFrame.")
         return df.iloc[0:0].copy()
 
-    df = df.copy()
-    df["_hts_norm"] = df["hts_code"].map(normalize_hts_code)
-
-    mask = pd.Series(False, index=df.index)
-    for prefix in norm_prefixes:
-        mask |= df["_hts_norm"].str.startswith(prefix, na=False)
+    # Same cleaning as normalize_hts_code, done column-wide in one pass.
+    hts_norm = (
+        df["hts_code"].astype("string")
+        .str.replace(".", "", regex=False)
+        .str.replace(" ", "", regex=False)
+        .str.strip()
+    )
+    mask = hts_norm.str.startswith(tuple(norm_prefixes), na=False).to_numpy(dtype=bool)
 
-    filtered = df.loc[mask].drop(columns=["_hts_norm"]).reset_index(drop=True)
+    filtered = df.loc[mask].reset_index(drop=True)
 
+    matched_norm = hts_norm[mask]
     matched_prefixes: list[str] = sorted(
-        p for p in norm_prefixes
-        if df["_hts_norm"].str.startswith(p, na=False).any()
+        p for p in norm_prefixes if matched_norm.str.startswith(p).any()
     )
     unmatched_prefixes: list[str] = sorted(set(norm_prefixes) - set(matched_prefixes))
 
@@ -233,7 +267,7 @@ def fetch_hts_dataframe(cfg: AppConfig) -> pd.DataFrame:
         raise ParseError(f"Failed to download CSV from {url}: {exc}") from exc
 
     try:
-        df = pd.read_csv(io.StringIO(text), dtype=str, low_memory=False)
+        df = _read_hts_csv(text)
     except Exception as exc:
         raise ParseError(f"Failed to parse CSV from {url}: {exc}") from exc
 
@@ -251,38 +285,90 @@ def fetch_hts_dataframe(cfg: AppConfig) -> pd.DataFrame:
 # ── Live lookup cache ─────────────────────────────────────────────────────────
 
 import math as _math
+from collections import OrderedDict
+import threading as _threading
 import time as _time
 
 _cache_df: pd.DataFrame | None = None
 _cache_ts: float = 0.0
 _CACHE_TTL_SECONDS = 3600  # refresh at most every hour
-
-
+# Validators from the last full download; an expired cache revalidates with a
+# conditional GET and keeps the parsed frame on 304 Not Modified.
+_cache_url: str | None = None
+_cache_etag: str | None = None
+_cache_last_modified: str | None = None
+# Serialises cold-cache downloads so concurrent misses share one USITC fetch.
+_cache_lock = _threading.Lock()
+# Every prefix (5+ digits) of every live code → the general rate % a lookup of
+# that prefix resolves to, or None when nothing at or above it parses.  Rebuilt
+# per download.
+_rate_by_prefix: dict[str, float | None] = {}
+_RATE_RE = re.compile(r"(\d+\.?\d*)%")
+# prefix → filtered rows for the current cached frame, most recent last.
+_ROWS_CACHE_MAX = 1024
+_rows_cache: OrderedDict[str, list[dict]] = OrderedDict()
+_rows_cache_df: pd.DataFrame | None = None
+_rows_lock = _threading.Lock()
 def _get_cached_full_df() -> pd.DataFrame | None:
     """Return a cached full-table DataFrame, downloading it if needed.
 
     Returns ``None`` on any failure so callers can degrade gracefully.
     """
-    global _cache_df, _cache_ts
-
-    now = _time.monotonic()
-    if _cache_df is not None and (now - _cache_ts) < _CACHE_TTL_SECONDS:
+    if _cache_df is not None and (_time.monotonic() - _cache_ts) < _CACHE_TTL_SECONDS:
         return _cache_df
 
+    with _cache_lock:
+        # Another request may have refreshed the cache while we waited.
+        now = _time.monotonic()
+        if _cache_df is not None and (now - _cache_ts) < _CACHE_TTL_SECONDS:
+            return _cache_df
+        return _download_full_df(now)
+
+
+def warm_live_cache() -> _threading.Thread:
+    """Load the live table on a daemon thread so the first lookup doesn't wait.
+
+    Requests arriving meanwhile block on the same lock and share the download.
+    """
+    thread = _threading.Thread(
+        target=_get_cached_full_df, name="usitc-warm", daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _download_full_df(now: float) -> pd.DataFrame | None:
+    global _cache_df, _cache_ts, _cache_url, _cache_etag, _cache_last_modified, _rate_by_prefix
+
     url = discover_usitc_csv_url()
     if not url:
         return None
 
+    headers: dict[str, str] = {}
+    if _cache_df is not None and url == _cache_url:
+        if _cache_etag:
+            headers["If-None-Match"] = _cache_etag
+        if _cache_last_modified:
+            headers["If-Modified-Since"] = _cache_last_modified
+
     logger.info("Live cache miss — downloading full HTS table from %s", url)
     try:
-        resp = http_get(url)
+        resp = http_get(url, headers=headers or None)
+        if resp.status_code == 304 and _cache_df is not None:
+            logger.info("Live cache revalidated (304 Not Modified)")
+            _cache_ts = now
+            return _cache_df
         text = resp.content.decode("utf-8-sig")
-        df = pd.read_csv(io.StringIO(text), dtype=str, low_memory=False)
+        df = _read_hts_csv(text)
         df = _rename_columns(df)
         df = normalize_dataframe(df)
         df["_hts_norm"] = df["hts_code"].map(normalize_hts_code)
+        _rate_by_prefix = _build_prefix_rates(df["_hts_norm"].unique(), _build_rate_map(df))
         _cache_df = df
         _cache_ts = now
+        _cache_url = url
+        _cache_etag = resp.headers.get("ETag")
+        _cache_last_modified = resp.headers.get("Last-Modified")
         logger.info("Live cache populated: %d rows", len(df))
         return df
     except Exception as exc:
@@ -290,11 +376,65 @@ def _get_cached_full_df() -> pd.DataFrame | None:
         return None
 
 
+def _build_rate_map(df: pd.DataFrame) -> dict[str, float]:
+    # Vectorised over the whole table; the last row for a code wins, and a
+    # later unparseable row for the same code drops any earlier rate.
+    raw = df["rate_general_raw"].astype("string").str.strip()
+    lowered = raw.str.lower()
+    usable = (
+        df["_hts_norm"].astype("string").fillna("").ne("")
+        & raw.fillna("").ne("")
+        & lowered.ne("none").fillna(False)
+    )
+    pct = pd.to_numeric(raw.str.extract(_RATE_RE, expand=False), errors="coerce")
+    pct = pct.mask(lowered.eq("free").fillna(False), 0.0)
+    last = pd.DataFrame({"code": df["_hts_norm"], "pct": pct})[usable]
+    last = last.drop_duplicates("code", keep="last").dropna(subset=["pct"])
+    return dict(zip(last["code"], last["pct"].astype(float)))
+
+
+def _build_prefix_rates(codes: Iterable[str], rate_map: dict[str, float]) -> dict[str, float | None]:
+    # Resolve the longest-match walk once per code so most lookups are one get.
+    resolved: dict[str, float | None] = {}
+    for code in codes:
+        if not isinstance(code, str):
+            continue
+        best: float | None = None
+        for length in range(5, len(code) + 1):
+            prefix = code[:length]
+            pct = rate_map.get(prefix)
+            if pct is not None:
+                best = pct
+            resolved[prefix] = best
+    return resolved
+
+
+def get_base_rate(hts: str) -> tuple[float, str]:
+    """Return ``(general_rate_pct, source)`` for a normalised HTS code.
+
+    Walks from the full code toward a 5-digit prefix until a parseable rate is
+    found in the live USITC table.  Returns ``(0.0, "not_found")`` otherwise.
+    """
+    if _get_cached_full_df() is None:
+        return 0.0, "not_found"
+    rates = _rate_by_prefix
+    # A code seen in the table hits on the first get; an unseen one stops at
+    # its longest known prefix, whose entry already holds the resolved rate.
+    for length in range(len(hts), 4, -1):
+        prefix = hts[:length]
+        if prefix in rates:
+            pct = rates[prefix]
+            return (pct, "usitc_live") if pct is not None else (0.0, "not_found")
+    return 0.0, "not_found"
+
+
 def fetch_live_rates(hts_prefix: str) -> list[dict]:
     """Query current HTS tariff rates directly from USITC (no database needed).
 
     Downloads and caches the full USITC HTS CSV in memory (refreshed at most
-    once per hour), then returns all rows matching *hts_prefix*.
+    once per hour), then returns all rows matching *hts_prefix*.  Filtered
+    rows are memoised per prefix until the table is refreshed, so the
+    returned list is shared and must not be mutated.
 
     Args:
         hts_prefix: Normalised (digits-only) prefix string, e.g. ``"6111"``.
@@ -302,15 +442,38 @@ def fetch_live_rates(hts_prefix: str) -> list[dict]:
     Returns:
         List of dicts with canonical column names, or ``[]`` on failure.
     """
+    global _rows_cache_df
+
     df = _get_cached_full_df()
     if df is None or df.empty:
         return []
 
+    with _rows_lock:
+        if _rows_cache_df is not df:
+            # The full table was refreshed; rows filtered from the old one are stale.
+            _rows_cache.clear()
+            _rows_cache_df = df
+        rows = _rows_cache.get(hts_prefix)
+        if rows is not None:
+            _rows_cache.move_to_end(hts_prefix)
+            return rows
+
     mask = df["_hts_norm"].str.startswith(hts_prefix, na=False)
     matched = df.loc[mask, OUTPUT_COLUMNS].copy()
     records = matched.to_dict(orient="records")
-    # Replace float NaN with None so the result is JSON-serialisable
-    return [
-        {k: None if (isinstance(v, float) and _math.isnan(v)) else v for k, v in row.items()}
+    # Replace float NaN (and <NA> from Arrow string columns) with None so the
+    # result is JSON-serialisable
+    rows = [
+        {
+            k: None if (v is pd.NA or (isinstance(v, float) and _math.isnan(v))) else v
+            for k, v in row.items()
+        }
         for row in records
-    ]
\ No newline at end of file
+    ]
+
+    with _rows_lock:
+        if _rows_cache_df is df:
+            _rows_cache[hts_prefix] = rows
+            if len(_rows_cache) > _ROWS_CACHE_MAX:
+                _rows_cache.popitem(last=False)
+    return rows
\ No newline at end of file
@@ -31,6 +31,7 @@ ADVISORY (confirmed in effect, excluded from calculation per operator preference
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from .antidumping import lookup_adcvd
 from .trade_compliance import get_compliance_flags
@@ -152,6 +153,7 @@ class TariffOverlay:
 
 # ── Main entry point ──────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4096)
 def compute_overlay(
     hts_code: str,
     origin: str,
@@ -171,7 +173,9 @@ def compute_overlay(
         base_rate_pct: MFN base rate as a percentage (e.g. ``5.0`` for 5 %).
 
     Returns:
-        :class:`TariffOverlay` with per-layer breakdown.
+        :class:`TariffOverlay` with per-layer breakdown.  Results are memoised
+        (the duty tables are static), so treat the returned overlay as
+        read-only.
     """
     origin_key = origin.strip().upper()
     chapter = hts_code[:2] if len(hts_code) >= 2 else hts_code
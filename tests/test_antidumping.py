@@ -0,0 +1,117 @@
+"""Tests for antidumping.py"""
+
+import pytest
+
+from tariff_watch.antidumping import (
+    _ADCVD_ORDERS,
+    get_all_orders,
+    get_orders_by_chapter,
+    lookup_adcvd,
+    lookup_adcvd_batch,
+)
+from tariff_watch.normalize import normalize_hts_code
+
+
+def _linear_scan(hts_code: str, origin: str) -> list[str]:
+    """Reference: the straightforward startswith() scan over every order."""
+    if origin.strip().upper() not in {"CN", "CHN", "CHINA", "中国", "PRC"}:
+        return []
+    norm = normalize_hts_code(hts_code) or ""
+    return [
+        o.case_number for o in _ADCVD_ORDERS
+        if o.status == "active" and any(norm.startswith(p) for p in o.hts_prefixes)
+    ]
+
+
+CODES = [
+    "7604.10.1000",   # aluminum extrusions
+    "7326.90.8688",   # two orders share heading 7326
+    "8544.42.9090",   # later prefix of a multi-prefix order
+    "8541.40.6020",   # solar cells, extreme rate
+    "7615",           # bare heading
+    "76",             # chapter only: shorter than any order prefix
+    "8471.30.0100",   # no order
+    "not a code",
+    "",
+]
+ORIGINS = ["CN", " cn ", "China", "PRC", "中国", "VN", "MX"]
+
+
+@pytest.mark.parametrize("origin", ORIGINS)
+@pytest.mark.parametrize("hts_code", CODES)
+def test_lookup_matches_linear_scan(hts_code, origin):
+    exposure = lookup_adcvd(hts_code, origin=origin)
+    assert [o.case_number for o in exposure.matching_orders] == _linear_scan(hts_code, origin)
+    assert exposure.hts_code == hts_code
+    assert exposure.origin == origin
+
+
+def test_lookup_prefix_match_and_risk():
+    exposure = lookup_adcvd("7326.90.8688")
+    assert [o.case_number for o in exposure.matching_orders] == [
+        "A-570-998 / C-570-999", "A-570-890",
+    ]
+    assert exposure.estimated_additional_pct == 187.25
+    d = exposure.as_dict()
+    assert d["matching_orders_count"] == 2
+    assert d["risk_level"] == "extreme"
+    assert d["matching_orders"][0]["order_type"] == "AD+CVD"
+    assert d["warning"].startswith("AD/CVD duties could add +187.2%")
+
+
+def test_lookup_no_match():
+    for code, origin in (("8471.30.0100", "CN"), ("7604.10.1000", "VN")):
+        assert lookup_adcvd(code, origin=origin).as_dict() == {
+            "hts_code": code,
+            "origin": origin,
+            "matching_orders_count": 0,
+            "matching_orders": [],
+            "estimated_additional_pct": 0.0,
+            "risk_level": "none",
+            "warning": None,
+        }
+
+
+def test_batch_matches_single_lookups_in_order():
+    codes = CODES + CODES[:3]
+    for origin in ("CN", "china", "VN"):
+        batch = lookup_adcvd_batch(codes, origin=origin)
+        assert [e.as_dict() for e in batch] == [
+            lookup_adcvd(c, origin=origin).as_dict() for c in codes
+        ]
+
+
+def test_get_orders_by_chapter():
+    assert [o.case_number for o in get_orders_by_chapter("85")] == [
+        "A-570-075 / C-570-076", "A-570-979 / C-570-980",
+    ]
+    assert [o.case_number for o in get_orders_by_chapter("7326")] == [
+        "A-570-998 / C-570-999", "A-570-890",
+    ]
+    assert len(get_orders_by_chapter("7")) == 9
+    assert get_orders_by_chapter("99") == []
+    assert get_orders_by_chapter("76", origin="VN") == []
+
+
+def test_get_all_orders():
+    assert get_all_orders() == [o for o in _ADCVD_ORDERS if o.status == "active"]
+    assert get_all_orders(status="revoked") == []
+    assert get_all_orders(origin="MX") == []
+
+
+def test_as_dict_results_do_not_share_state():
+    first = lookup_adcvd("7604.10.1000").as_dict()
+    first["extra"] = True
+    first["matching_orders"][0]["country"] = "XX"
+    first["matching_orders"][0]["notes"].append("mutated")
+    first["matching_orders"].clear()
+
+    second = lookup_adcvd("7604.10.1000").as_dict()
+    assert "extra" not in second
+    assert second["matching_orders_count"] == len(second["matching_orders"]) == 1
+    assert second["matching_orders"][0]["country"] == "CN"
+    assert "mutated" not in second["matching_orders"][0]["notes"]
+
+    exposure = lookup_adcvd("8471.30.0100")
+    exposure.as_dict()["matching_orders"].append("x")
+    assert exposure.as_dict()["matching_orders"] == []
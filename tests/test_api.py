@@ -0,0 +1,76 @@
+"""Tests for api.py"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from tariff_watch.api import app
+
+# No context manager: the lifespan (DB pool, USITC warm-up, scheduler) is not run.
+client = TestClient(app)
+
+
+def test_cached_endpoint_sends_weak_etag_and_cache_control():
+    resp = client.get("/amazon/categories")
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('W/"')
+    assert "max-age=3600" in resp.headers["cache-control"]
+
+
+def test_if_none_match_returns_304():
+    etag = client.get("/amazon/categories").headers["etag"]
+    resp = client.get("/amazon/categories", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = client.get("/amazon/categories").headers["etag"]
+    opaque = etag.removeprefix("W/")
+    for header in (opaque, f'"other", {etag}', "*"):
+        resp = client.get("/amazon/categories", headers={"If-None-Match": header})
+        assert resp.status_code == 304, header
+    resp = client.get("/amazon/categories", headers={"If-None-Match": 'W/"other"'})
+    assert resp.status_code == 200
+
+
+def test_large_bodies_are_gzipped():
+    resp = client.get("/amazon/categories", headers={"Accept-Encoding": "gzip"})
+    assert len(resp.content) >= 1024
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    # Same weak validator whatever the encoding.
+    plain = client.get("/amazon/categories", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == resp.headers["etag"]
+
+
+def test_small_bodies_are_not_gzipped():
+    resp = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert len(resp.content) < 1024
+    assert "content-encoding" not in resp.headers
+
+
+def test_live_tariff_serialised_without_deprecated_response_class(monkeypatch, recwarn):
+    rows = [{"hts_code": "6111200000", "rate_general_raw": "14.9%", "rate_general_value": 14.9}]
+    monkeypatch.setattr("tariff_watch.api.fetch_live_rates", lambda prefix: rows)
+    resp = client.get("/live/tariff/6111.20")
+    assert resp.status_code == 200
+    assert resp.json() == rows
+    assert client.get("/health").status_code == 200
+    assert not [w for w in recwarn if "ORJSONResponse" in str(w.message)]
+
+
+def test_cached_endpoints_document_list_schema():
+    paths = client.get("/openapi.json").json()["paths"]
+    for path in (
+        "/tariff/{hts_code}", "/tariff/{hts_code}/history", "/live/tariff/{hts_code}",
+        "/notices", "/amazon/categories",
+    ):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["type"] == "array", path
+        assert schema["items"]["type"] == "object", path
@@ -0,0 +1,30 @@
+"""Tests for cli.py"""
+
+import argparse
+import threading
+
+import pytest
+
+from tariff_watch import cli, sources_fedregister, sources_usitc
+from tariff_watch.http import NetworkError
+
+
+def test_run_fetch_failure_exits_without_starting_notices(tmp_path, monkeypatch):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        f"storage:\n  snapshots_dir: {tmp_path / 'snapshots'}\n  reports_dir: {tmp_path / 'reports'}\n"
+    )
+
+    def fail(cfg):
+        raise NetworkError("USITC unreachable")
+
+    notices_started = threading.Event()
+    monkeypatch.setattr(sources_usitc, "fetch_hts_dataframe", fail)
+    monkeypatch.setattr(sources_fedregister, "fetch_notices", notices_started.set)
+
+    args = argparse.Namespace(config=str(config), mode=None, tracked_hts_file=None, dry_run=False)
+    with pytest.raises(SystemExit) as exc_info:
+        cli._cmd_run(args)
+    assert exc_info.value.code == 3
+    # A fetch in flight would hold up interpreter exit after the failure.
+    assert not notices_started.wait(0.2)
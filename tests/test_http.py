@@ -0,0 +1,126 @@
+"""Tests for http.py"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tariff_watch import http
+
+
+@pytest.fixture
+def failing_server(monkeypatch):
+    """Local server that always answers 503; yields (url, hit counter)."""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    monkeypatch.setattr(http, "BACKOFF_FACTOR", 0)
+    http.close_session()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/", hits
+    finally:
+        server.shutdown()
+        server.server_close()
+        http.close_session()
+
+
+def test_default_retries_is_total_attempts(failing_server):
+    url, hits = failing_server
+    with pytest.raises(http.NetworkError):
+        http.get(url)
+    assert len(hits) == http.DEFAULT_RETRIES
+
+
+def test_retries_keyword_sets_attempts_per_call(failing_server):
+    url, hits = failing_server
+    with pytest.raises(http.NetworkError):
+        http.get(url, retries=1)
+    assert len(hits) == 1
+    hits.clear()
+    with pytest.raises(http.NetworkError):
+        http.get(url, retries=5)
+    assert len(hits) == 5
+
+
+class _FakeResponse:
+    def __init__(self, url):
+        self.url = url
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """Answers instantly except for URLs in *delays*; URLs in *fail* raise."""
+
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+
+    def get(self, url, **kwargs):
+        if url in self.delays:
+            threading.Event().wait(self.delays[url])
+        if url in self.fail:
+            raise http.requests.exceptions.ConnectionError(f"refused: {url}")
+        return _FakeResponse(url)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_session():
+    def install(**kwargs):
+        session = _FakeSession(**kwargs)
+        http.set_session(session)
+        return session
+
+    yield install
+    http.set_session(None)
+
+
+def test_get_many_preserves_input_order(fake_session):
+    urls = [f"https://example.test/{i}" for i in range(6)]
+    # Earlier URLs finish last.
+    fake_session(delays={u: 0.05 * (len(urls) - i) for i, u in enumerate(urls)})
+    assert [r.url for r in http.get_many(urls, max_workers=6)] == urls
+
+
+def test_get_many_propagates_network_error(fake_session):
+    urls = ["https://example.test/a", "https://example.test/b", "https://example.test/c"]
+    fake_session(fail={urls[1]})
+    with pytest.raises(http.NetworkError, match="example.test/b"):
+        http.get_many(urls)
+    results = http.get_many(urls, return_exceptions=True)
+    assert [r.url for r in (results[0], results[2])] == [urls[0], urls[2]]
+    assert isinstance(results[1], http.NetworkError)
+
+
+def test_get_many_caps_workers_at_pool_size(fake_session, monkeypatch):
+    fake_session()
+    seen = []
+
+    class RecordingPool(http.ThreadPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            seen.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(http, "ThreadPoolExecutor", RecordingPool)
+    urls = [f"https://example.test/{i}" for i in range(http.POOL_MAXSIZE + 10)]
+    http.get_many(urls, max_workers=1000)
+    http.get_many(urls[:3], max_workers=1000)
+    assert seen == [http.POOL_MAXSIZE, 3]
+    adapter = http._new_session(http.DEFAULT_RETRIES).get_adapter("https://example.test/")
+    assert adapter._pool_maxsize == http.POOL_MAXSIZE
@@ -18,6 +18,12 @@ def test_hts_code_none():
     assert normalize_hts_code(None) is None
 
 
+def test_hts_code_already_clean():
+    assert normalize_hts_code("8471300000") == "8471300000"
+    assert normalize_hts_code("") is None
+    assert normalize_hts_code(" 8471 ") == "8471"
+
+
 def test_parse_rate_free():
     assert parse_rate("Free") == 0.0
     assert parse_rate("FREE") == 0.0
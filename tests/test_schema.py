@@ -0,0 +1,48 @@
+"""Tests for schema.sql
+
+The live test needs a scratch PostgreSQL database: set TARIFF_WATCH_TEST_PG=1
+along with the usual PGHOST/PGDATABASE/PGUSER/PGPASSWORD variables.
+"""
+
+import os
+import re
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+SCHEMA = (Path(__file__).parent.parent / "src" / "tariff_watch" / "schema.sql").read_text()
+
+_TEXT_COLUMNS = (
+    "description", "rate_general_raw", "rate_special_raw", "rate_column2_raw",
+    "additional_duties_raw",
+)
+
+
+def test_snapshot_indexes_do_not_include_text_columns():
+    for include in re.findall(r"INCLUDE\s*\(([^)]*)\)", SCHEMA):
+        assert not set(_TEXT_COLUMNS) & {c.strip() for c in include.split(",")}
+
+
+@pytest.mark.skipif(not os.environ.get("TARIFF_WATCH_TEST_PG"), reason="no test database")
+def test_long_description_loads():
+    pytest.importorskip("psycopg2")
+    from tariff_watch import db
+
+    snapshot_date = "1999-01-04"
+    df = pd.DataFrame({
+        "hts_code": ["9999999999"],
+        # Random text so TOAST compression cannot squeeze it under the btree limit.
+        "description": [os.urandom(4500).hex()],
+        "rate_general_raw": ["Free"],
+    })
+    db.init_pool(1, 1)
+    try:
+        db.apply_schema()
+        assert db.copy_snapshots(df, snapshot_date) == 1
+        rows = db.query_rate_history("9999999999")
+        assert rows[0]["rate_general_raw"] == "Free"
+    finally:
+        with db.get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM hts_snapshots WHERE snapshot_date = %s", (snapshot_date,))
+        db.close_pool()
@@ -0,0 +1,167 @@
+"""Tests for snapshot.py"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tariff_watch.normalize import normalize_dataframe
+from tariff_watch.snapshot import (
+    apply_retention,
+    find_previous_snapshot,
+    iter_snapshots,
+    list_snapshots,
+    load_snapshot,
+    save_snapshot,
+)
+
+SAMPLE = pd.DataFrame({
+    "hts_code": ["0101.21.00", "8542.31.00", "0202.30.00"],
+    "description": ["Horses, live", 'Processors "and" controllers', None],
+    "rate_general_raw": ["Free", "5%", "26.4%"],
+    "rate_special_raw": ["Free", None, "Free"],
+    "rate_column2_raw": ["20%", "35%", None],
+})
+
+
+def test_save_load_roundtrip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        df = normalize_dataframe(SAMPLE)
+        path = save_snapshot(df, tmpdir, date(2025, 1, 6))
+        loaded = normalize_dataframe(load_snapshot(path))
+        assert list(loaded["hts_code"]) == ["01012100", "85423100", "02023000"]
+        assert loaded.loc[1, "description"] == 'Processors "and" controllers'
+        assert loaded.loc[1, "rate_general_value"] == 5.0
+
+
+def test_list_snapshots_sorted_oldest_first():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for d in (date(2025, 1, 13), date(2024, 12, 30), date(2025, 1, 6)):
+            save_snapshot(SAMPLE, tmpdir, d)
+        (Path(tmpdir) / "notes.txt").write_text("not a snapshot")
+        names = [p.name for p in list_snapshots(tmpdir)]
+        assert names == [
+            "hts_snapshot_20241230.csv.gz",
+            "hts_snapshot_20250106.csv.gz",
+            "hts_snapshot_20250113.csv.gz",
+        ]
+
+
+def test_list_snapshots_missing_dir():
+    assert list_snapshots("/nonexistent/tariff-watch-snapshots") == []
+
+
+def test_find_previous_snapshot():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for d in (date(2024, 12, 30), date(2025, 1, 6), date(2025, 1, 13)):
+            save_snapshot(SAMPLE, tmpdir, d)
+        prev = find_previous_snapshot(tmpdir, date(2025, 1, 13))
+        assert prev is not None and prev.name == "hts_snapshot_20250106.csv.gz"
+        assert find_previous_snapshot(tmpdir, date(2024, 12, 30)) is None
+        assert find_previous_snapshot(tmpdir).name == "hts_snapshot_20250106.csv.gz"
+
+
+def test_apply_retention_deletes_oldest():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for day in range(1, 8):
+            save_snapshot(SAMPLE, tmpdir, date(2025, 1, day))
+        deleted = apply_retention(tmpdir, retain_weeks=2)
+        assert [p.name for p in deleted] == [
+            "hts_snapshot_20250101.csv.gz",
+            "hts_snapshot_20250102.csv.gz",
+            "hts_snapshot_20250103.csv.gz",
+        ]
+        assert len(list_snapshots(tmpdir)) == 4
+
+
+def test_legacy_uncompressed_snapshots_still_listed():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy = Path(tmpdir) / "hts_snapshot_20241230.csv"
+        SAMPLE.to_csv(legacy, index=False)
+        save_snapshot(SAMPLE, tmpdir, date(2025, 1, 6))
+        assert list_snapshots(tmpdir)[0] == legacy
+        assert len(load_snapshot(legacy)) == 3
+
+
+def test_snapshots_partitioned_by_year():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_snapshot(SAMPLE, tmpdir, date(2024, 12, 30))
+        assert path == Path(tmpdir) / "2024" / "hts_snapshot_20241230.csv.gz"
+        save_snapshot(SAMPLE, tmpdir, date(2025, 1, 6))
+        save_snapshot(SAMPLE, tmpdir, date(2025, 1, 13))
+        apply_retention(tmpdir, retain_weeks=1)
+        assert not (Path(tmpdir) / "2024").exists()
+        assert [p.parent.name for p in list_snapshots(tmpdir)] == ["2025", "2025"]
+
+
+def test_iter_snapshots_newest_first_across_years():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for d in (date(2024, 12, 23), date(2024, 12, 30), date(2025, 1, 6)):
+            save_snapshot(SAMPLE, tmpdir, d)
+        names = [p.name for p in iter_snapshots(tmpdir, newest_first=True)]
+        assert names == [
+            "hts_snapshot_20250106.csv.gz",
+            "hts_snapshot_20241230.csv.gz",
+            "hts_snapshot_20241223.csv.gz",
+        ]
+        prev = find_previous_snapshot(tmpdir, date(2025, 1, 6))
+        assert prev is not None and prev.name == "hts_snapshot_20241230.csv.gz"
+
+
+def test_parquet_copy_preferred_and_removed_with_csv():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        df = normalize_dataframe(SAMPLE)
+        path = save_snapshot(df, tmpdir, date(2025, 1, 6))
+        parquet = path.with_name("hts_snapshot_20250106.parquet")
+        assert parquet.exists()
+        assert list_snapshots(tmpdir) == [path]
+        loaded = normalize_dataframe(load_snapshot(path))
+        assert list(loaded["hts_code"]) == ["01012100", "85423100", "02023000"]
+        save_snapshot(df, tmpdir, date(2025, 1, 13))
+        save_snapshot(df, tmpdir, date(2025, 1, 20))
+        apply_retention(tmpdir, retain_weeks=1)
+        assert not parquet.exists()
+
+
+def test_listing_not_stale_when_directory_mtime_does_not_move():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = save_snapshot(SAMPLE, tmpdir, date(2025, 1, 6))
+        year_dir = first.parent
+        st = year_dir.stat()
+        assert list_snapshots(tmpdir) == [first]
+        # Second save in the same tick, on a filesystem whose directory
+        # mtime/size don't change: the cached listing must not be reused.
+        second = save_snapshot(SAMPLE, tmpdir, date(2025, 1, 13))
+        os.utime(year_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert list_snapshots(tmpdir) == [first, second]
+        assert find_previous_snapshot(tmpdir, date(2025, 1, 20)) == second
+
+        third = save_snapshot(SAMPLE, tmpdir, date(2025, 1, 20))
+        st = year_dir.stat()
+        assert len(list_snapshots(tmpdir)) == 3
+        apply_retention(tmpdir, retain_weeks=1)
+        os.utime(year_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert list_snapshots(tmpdir) == [second, third]
+
+
+def test_parquet_and_csv_loads_agree_on_dtypes(monkeypatch):
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = save_snapshot(normalize_dataframe(SAMPLE), tmpdir, date(2025, 1, 6))
+        via_parquet = load_snapshot(path)
+        path.with_name("hts_snapshot_20250106.parquet").unlink()
+        via_arrow_csv = load_snapshot(path)
+        # Without pyarrow, pandas' own CSV reader defines the contract.
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+        via_pandas_csv = load_snapshot(path)
+
+    for loaded in (via_parquet, via_arrow_csv):
+        assert loaded.dtypes.to_dict() == via_pandas_csv.dtypes.to_dict()
+        pd.testing.assert_frame_equal(loaded, via_pandas_csv)
+    assert via_parquet.loc[1, "rate_general_value"] == "5"
+    assert pd.isna(via_parquet.loc[2, "description"])
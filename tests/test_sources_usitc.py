@@ -0,0 +1,135 @@
+"""Tests for sources_usitc.py live lookup cache"""
+
+import re
+import threading
+
+import pytest
+
+from tariff_watch import sources_usitc
+from tariff_watch.normalize import normalize_hts_code
+from tariff_watch.sources_usitc import _read_hts_csv, fetch_live_rates, get_base_rate
+
+CSV = b"""HTS Number,Description,General Rate of Duty,Special,Column 2
+0101,Live horses,,,
+0101.21.00,Purebred breeding horses,Free,,Free
+0101.29.00,Other horses,4.5%,Free (A+),20%
+0101.29.0010,Imported for immediate slaughter,,,
+0102.21.00,Purebred cattle,None,,
+0103.91.00,Swine,See note 3,,
+0201.10.05,Beef carcasses,4.4 cents/kg + 26.4%,,
+0201.10.05,Beef carcasses (restated),2%,,
+"""
+
+
+class _FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+@pytest.fixture
+def live(monkeypatch):
+    """Fresh live cache fed by a fake USITC server; yields the request log."""
+    for name, value in (
+        ("_cache_df", None), ("_cache_ts", 0.0), ("_cache_url", None),
+        ("_cache_etag", None), ("_cache_last_modified", None), ("_rate_by_prefix", {}),
+    ):
+        monkeypatch.setattr(sources_usitc, name, value)
+    requests = []
+
+    def fake_get(url, headers=None):
+        requests.append(headers or {})
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return _FakeResponse(304)
+        return _FakeResponse(200, CSV, {"ETag": '"v1"'})
+
+    monkeypatch.setattr(sources_usitc, "discover_usitc_csv_url", lambda: "https://usitc.test/hts.csv")
+    monkeypatch.setattr(sources_usitc, "http_get", fake_get)
+    return requests
+
+
+def _walk_rows(hts: str) -> tuple[float, str]:
+    """Reference: the per-request walk get_base_rate replaced."""
+    rate_map: dict[str, str] = {}
+    for r in fetch_live_rates(hts[:4]):
+        code = normalize_hts_code(str(r.get("hts_code") or ""))
+        raw = str(r.get("rate_general_raw") or "").strip()
+        if code and raw and raw.lower() not in ("none", ""):
+            rate_map[code] = raw
+    for length in range(len(hts), 4, -1):
+        raw = rate_map.get(hts[:length])
+        if raw is not None:
+            if raw.lower() == "free":
+                return 0.0, "usitc_live"
+            m = re.search(r"(\d+\.?\d*)%", raw)
+            if m:
+                return float(m.group(1)), "usitc_live"
+    return 0.0, "not_found"
+
+
+@pytest.mark.parametrize("hts, expected", [
+    ("01012100", (0.0, "usitc_live")),        # exact, Free
+    ("01012900", (4.5, "usitc_live")),        # exact
+    ("0101290010", (4.5, "usitc_live")),      # listed, no rate: falls back to 8-digit
+    ("0101290099", (4.5, "usitc_live")),      # not listed: longest known prefix
+    ("0101299999", (0.0, "not_found")),       # not listed, no rated prefix
+    ("0201100500", (2.0, "usitc_live")),      # last row for a code wins
+    ("01022100", (0.0, "not_found")),         # "None" rate
+    ("01039100", (0.0, "not_found")),         # unparseable rate
+    ("0101", (0.0, "not_found")),             # shorter than any indexed prefix
+    ("99999999", (0.0, "not_found")),         # missing
+])
+def test_get_base_rate(live, hts, expected):
+    assert get_base_rate(hts) == expected
+    assert get_base_rate(hts) == _walk_rows(hts)
+
+
+def test_get_base_rate_without_table(monkeypatch, live):
+    monkeypatch.setattr(sources_usitc, "discover_usitc_csv_url", lambda: None)
+    assert get_base_rate("01012100") == (0.0, "not_found")
+
+
+def test_expired_cache_revalidates_with_conditional_get(live):
+    df = sources_usitc._get_cached_full_df()
+    assert live == [{}]
+    sources_usitc._cache_ts -= sources_usitc._CACHE_TTL_SECONDS + 1
+    assert sources_usitc._get_cached_full_df() is df
+    assert live[1] == {"If-None-Match": '"v1"'}
+    assert get_base_rate("01012900") == (4.5, "usitc_live")
+
+
+def test_concurrent_cold_misses_share_one_download(monkeypatch, live):
+    release = threading.Event()
+    fake_get = sources_usitc.http_get
+
+    def slow_get(url, headers=None):
+        release.wait(5)
+        return fake_get(url, headers=headers)
+
+    monkeypatch.setattr(sources_usitc, "http_get", slow_get)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(sources_usitc._get_cached_full_df()))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(live) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_read_hts_csv_keeps_quoted_newlines_across_blocks():
+    pytest.importorskip("pyarrow")
+    # ~2 MB, well past Arrow's 1 MiB read block, with a line break in every
+    # description so block boundaries land inside quoted values.
+    lines = ["HTS Number,Description,General Rate of Duty"]
+    lines += [f'{i:010d},"Item {i}\ncontinued",5%' for i in range(60_000)]
+    text = "\n".join(lines) + "\n"
+    assert len(text) > 1 << 20
+    df = _read_hts_csv(text)
+    assert df.shape == (60_000, 3)
+    assert df.iloc[-1].tolist() == ["0000059999", "Item 59999\ncontinued", "5%"]